@@ -0,0 +1,133 @@
+"""Persistent, content-addressed analysis cache backed by SQLite.
+
+Two tables:
+  imports  git blob hash of a file (plus extractor version) -> extracted import specifiers
+  graphs   (repo, commit, analysis version)                  -> finished import graph
+
+Entries carry their size and last-use time; once the cache grows past `max_bytes`
+the least recently used entries are evicted. Keys include the extractor/analysis
+version, so changing either makes old entries unreachable and they age out.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+SCHEMA_VERSION = 1
+
+
+def blob_hash(data):
+    """Git blob SHA-1 of file contents (the same id GitHub uses for the file)"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class AnalysisCache:
+    """SQLite store for per-file imports and per-commit graphs, with LRU eviction and hit/miss counters"""
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {'imports_hit': 0, 'imports_miss': 0, 'graph_hit': 0, 'graph_miss': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._db.executescript("""
+                DROP TABLE IF EXISTS imports;
+                DROP TABLE IF EXISTS graphs;
+            """)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS imports (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS graphs (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS imports_lru ON imports (last_used);
+            CREATE INDEX IF NOT EXISTS graphs_lru ON graphs (last_used);
+        """)
+        self._db.commit()
+
+    def get_imports_many(self, keys):
+        """Look up cached import lists for many blob keys at once. Returns {key: imports}."""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, value FROM imports WHERE key IN ({placeholders})", chunk).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+                self._db.execute(
+                    f"UPDATE imports SET last_used = ? WHERE key IN ({placeholders})", [time.time(), *chunk])
+            self._db.commit()
+        hits = sum(1 for key in keys if key in found)
+        self.stats['imports_hit'] += hits
+        self.stats['imports_miss'] += len(keys) - hits
+        return found
+
+    def put_imports_many(self, items):
+        """Store {key: imports} and evict old entries if the cache is over its size limit"""
+        now = time.time()
+        rows = []
+        for key, imports in items.items():
+            value = json.dumps(imports)
+            rows.append((key, value, len(value), now))
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+        self.evict()
+
+    def get_graph(self, key):
+        """Return the cached graph payload for a (repo, commit, version) key, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM graphs WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._db.execute("UPDATE graphs SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+        self.stats['graph_hit' if row else 'graph_miss'] += 1
+        return json.loads(row[0]) if row else None
+
+    def put_graph(self, key, payload):
+        value = json.dumps(payload)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO graphs VALUES (?, ?, ?, ?)", (key, value, len(value), time.time()))
+            self._db.commit()
+        self.evict()
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+                       for table in ('imports', 'graphs'))
+
+    def evict(self):
+        """Drop least recently used entries (across both tables) until under max_bytes"""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        with self._lock:
+            rows = self._db.execute("""
+                SELECT 'imports', key, size, last_used FROM imports
+                UNION ALL SELECT 'graphs', key, size, last_used FROM graphs
+                ORDER BY last_used""")
+            doomed = []
+            for table, key, size, _ in rows:
+                if excess <= 0:
+                    break
+                doomed.append((table, key))
+                excess -= size
+            for table, key in doomed:
+                self._db.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+            self._db.commit()
+        self.stats['evicted'] += len(doomed)
+
+    def summary(self):
+        imports_total = self.stats['imports_hit'] + self.stats['imports_miss']
+        return (f"imports {self.stats['imports_hit']}/{imports_total} hits, "
+                f"graphs {self.stats['graph_hit']}/{self.stats['graph_hit'] + self.stats['graph_miss']} hits, "
+                f"{self.stats['evicted']} evicted")
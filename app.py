@@ -1,9 +1,28 @@
-from flask import Flask, Response, send_file
+from flask import Flask, Response, jsonify, request, send_file, url_for
 import os
-from main import generate_svg_for_github_repo
-import requests
+import sys
+from datetime import datetime, timezone
+from markupsafe import escape
+from jobs import JobManager, QueueFull
+import metrics
+from render import RENDER_STATS
+from result_cache import RESULT_CACHE, json_result_key, svg_result_key
+from views import VIEWS
+
+# Cold starts only load what `/` and cache hits need: main.py (and with it networkx, requests and the
+# analysis pipeline) is imported by the first request that has to analyze. See benchmarks/bench_startup.py.
+
+# Analysis runs in a bounded background pool; requests wait at most `?wait=` seconds for it
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_QUEUE_LIMIT = int(os.environ.get('JOB_QUEUE_LIMIT', '100'))
+JOB_WAIT_SECONDS = float(os.environ.get('JOB_WAIT_SECONDS', '0'))
+# A failed analysis is answered from memory for this long before it can be retried
+JOB_FAILURE_TTL = int(os.environ.get('JOB_FAILURE_TTL', '60'))
+MAX_WAIT_SECONDS = 30
 
 app = Flask(__name__)
+JOBS = JobManager(JOB_WORKERS, JOB_QUEUE_LIMIT, keep_failed=JOB_FAILURE_TTL)
+metrics.enable()  # per-stage timings for /metrics
 
 @app.route('/')
 def landing_page():
@@ -19,14 +38,125 @@ def landing_page():
     </html>
     '''
 
+def cached_response(entry, mimetype):
+    """Serve a RESULT_CACHE entry with ETag/Last-Modified, answering 304 if the client's copy is current"""
+    last_modified = datetime.fromtimestamp(int(entry.last_modified), timezone.utc)
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(entry.etag)
+    else:
+        not_modified = request.if_modified_since is not None and last_modified <= request.if_modified_since
+    if not_modified:
+        response = Response(status=304)
+    else:
+        response = Response(RESULT_CACHE.read(entry), mimetype=mimetype)
+    response.set_etag(entry.etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.no_cache = True  # revalidate, which is a cheap 304 while the result is cached
+    return response
+
+def wait_seconds():
+    """Long-poll time requested with ?wait=, capped at MAX_WAIT_SECONDS"""
+    return min(max(request.args.get('wait', JOB_WAIT_SECONDS, type=float), 0), MAX_WAIT_SECONDS)
+
+def accepted_response(job):
+    """202 for a job still in progress: an auto-refreshing page for browsers, JSON with a status URL otherwise"""
+    status_url = url_for('job_status', job_id=job.id)
+    if request.accept_mimetypes.accept_html:
+        response = Response(f'''
+    <html>
+    <head><title>Zombie File Hunter</title><meta http-equiv="refresh" content="3"></head>
+    <body>
+        <h1>Analyzing {escape(job.info.get('repo', 'repository'))}...</h1>
+        <p>This page refreshes automatically. Job status: <a href="{status_url}">{job.status}</a></p>
+    </body>
+    </html>
+    ''', status=202, mimetype='text/html')
+    else:
+        response = jsonify({**job.to_dict(), 'status_url': status_url})
+        response.status_code = 202
+    response.headers['Location'] = status_url
+    response.headers['Retry-After'] = '2'
+    return response
+
+def failed_response(job):
+    """Error page for a failed job; unlike the 202 page it does not refresh, so the browser stops retrying"""
+    return Response(f'''
+    <html>
+    <head><title>Zombie File Hunter</title></head>
+    <body>
+        <h1>Could not analyze {escape(job.info.get('repo', 'repository'))}</h1>
+        <p>{escape(job.error)}</p>
+        <p>Retry in {JOB_FAILURE_TTL} seconds or later.</p>
+    </body>
+    </html>
+    ''', status=500, mimetype='text/html')
+
+def run_analysis(cache_key, function, username, repo, **kwargs):
+    """Return the finished job for cache_key, or a response while it is still running (202) or once it
+    has failed (an error page for browsers; others get the error raised)"""
+    github_token = os.environ.get('GITHUB_TOKEN')
+    # Concurrent requests for the same result share one job
+    job = JOBS.submit(cache_key, function, username, repo, github_token=github_token, **kwargs)
+    job.info.setdefault('repo', f"{username}/{repo}")
+    job.info.setdefault('result_url', request.path)
+    if not job.wait(wait_seconds()):
+        return job, accepted_response(job)
+    if job.status == 'failed':
+        if request.accept_mimetypes.accept_html:
+            return job, failed_response(job)
+        raise RuntimeError(job.error)
+    return job, None
+
+@app.route('/<username>/<repo>.json')
+def repo_json(username, repo):
+    """Analysis report (entry points, connected/unused files, edges) without rendering anything"""
+    try:
+        cache_key = json_result_key(username, repo)
+        entry = RESULT_CACHE.get(cache_key)
+        if entry is None:
+            from main import generate_json_for_github_repo
+            job, pending = run_analysis(cache_key, generate_json_for_github_repo, username, repo)
+            if pending:
+                return pending
+            entry = RESULT_CACHE.get(cache_key) or job.result
+        return cached_response(entry, 'application/json')
+    except QueueFull as e:
+        return jsonify({'error': f"Too many analyses in progress: {e}"}), 503, {'Retry-After': '30'}
+    except Exception as e:
+        return jsonify({'error': f"Error analyzing repository: {e}"}), 500
+
+def view_options():
+    """Level of detail from ?view=full|clusters|unused, ?depth=<n> and ?collapse=dir1,dir2"""
+    view = request.args.get('view', 'full')
+    if view not in VIEWS:
+        raise ValueError(f"unknown view {view!r}, expected one of {', '.join(VIEWS)}")
+    collapse = [prefix for prefix in request.args.get('collapse', '').split(',') if prefix] or None
+    return {'view': view, 'depth': max(request.args.get('depth', 1, type=int), 1), 'collapse': collapse}
+
 @app.route('/<username>/<repo>')
 def repo_svg(username, repo):
     try:
-        github_token = os.environ.get('GITHUB_TOKEN')
-        svg_url = generate_svg_for_github_repo(username, repo, github_token=github_token)
+        options = view_options()
+    except ValueError as e:
+        return Response(str(e), mimetype='text/plain', status=400)
+    try:
+        cache_key = svg_result_key(username, repo, **options)
+        entry = RESULT_CACHE.get(cache_key)
+        if entry:
+            return cached_response(entry, 'image/svg+xml')
+        from main import generate_svg_for_github_repo
+        job, pending = run_analysis(cache_key, generate_svg_for_github_repo, username, repo, **options)
+        if pending:
+            return pending
+        entry = RESULT_CACHE.get(cache_key)
+        if entry:
+            return cached_response(entry, 'image/svg+xml')
+        svg_url = job.result
         if svg_url.startswith('http://') or svg_url.startswith('https://'):
             # Fetch the SVG content from the URL
-            svg_response = requests.get(svg_url)
+            from http_pool import session_request
+            svg_response = session_request('GET', svg_url)
             svg_response.raise_for_status()
             return Response(svg_response.content, mimetype='image/svg+xml')
         else:
@@ -34,17 +164,47 @@ def repo_svg(username, repo):
             with open(svg_url, 'r', encoding='utf-8') as f:
                 svg_content = f.read()
             return Response(svg_content, mimetype='image/svg+xml')
+    except QueueFull as e:
+        return Response(f"Too many analyses in progress: {e}", mimetype='text/plain', status=503,
+                        headers={'Retry-After': '30'})
     except Exception as e:
         return Response(f"Error generating SVG: {e}", mimetype='text/plain', status=500)
 
-# Note: SVG caching is handled in main.py (generate_svg_for_github_repo). This route always serves the cached SVG if available.
+# Job routes live under /_jobs: GitHub usernames cannot start with an underscore
+@app.route('/_jobs/<job_id>')
+def job_status(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown or expired job'}), 404
+    job.wait(wait_seconds())
+    return jsonify(job.to_dict())
+
+@app.route('/_jobs')
+def job_metrics():
+    return jsonify(JOBS.snapshot())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text format: stage histograms, cache hit ratios, job and render counters"""
+    stats = RESULT_CACHE.stats
+    caches = {'result': (stats['memory_hit'] + stats['disk_hit'], stats['miss'])}
+    # Analysis cache stats exist once a request has loaded main.py
+    main = sys.modules.get('main')
+    analysis_cache = main.get_analysis_cache() if main is not None else None
+    if analysis_cache is not None:
+        stats = analysis_cache.stats
+        caches['imports'] = (stats['imports_hit'], stats['imports_miss'])
+        caches['graphs'] = (stats['graph_hit'], stats['graph_miss'])
+    jobs = JOBS.snapshot()
+    counters = {f'jobs_{name}_total': jobs[name]
+                for name in ('submitted', 'deduplicated', 'rejected', 'succeeded', 'failed', 'failure_reused')}
+    for backend, totals in RENDER_STATS.items():
+        counters[f'render_total{{backend="{backend}"}}'] = totals['renders']
+        counters[f'render_seconds_total{{backend="{backend}"}}'] = round(totals['seconds'], 6)
+    gauges = {'jobs_queued': jobs['queued'], 'jobs_running': jobs['running']}
+    return Response(metrics.prometheus_text(caches, counters, gauges), mimetype='text/plain; version=0.0.4')
 
-def dot_to_svg(dot_code):
-    url = 'https://kroki.io/graphviz/svg'
-    headers = {'Content-Type': 'text/plain'}
-    response = requests.post(url, headers=headers, data=dot_code.encode('utf-8'))
-    response.raise_for_status()
-    return response.text  # This is the SVG as a string
+# Note: SVG caching is handled by result_cache.RESULT_CACHE, which generate_svg_for_github_repo fills. This route always serves the cached SVG if available.
 
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""Asset references: find the images, stylesheets and documents a file points at by name.
+
+Catches what import extraction cannot see: `url(...)` in CSS, `src="/logo.png"` and other
+string literals naming an asset. References are only taken from string and template literals
+and from `url(...)`, as found by the import scanner's lexer (extractors.scan_statements), so
+names in comments and identifiers like `data.json` are ignored. The fixed set of asset
+extensions anchors the search within them, and each hit is then expanded to the whole reference.
+The cost does not grow with the number of assets in the repo. AssetIndex then resolves each
+reference by basename: by path where it can, and by a unique file name where it cannot.
+"""
+import bisect
+import os
+import pathlib
+import re
+
+from extractors import scan_statements
+
+
+# Bump when reference extraction changes, to invalidate cached per-file results
+VERSION = 2
+# The asset types that become graph nodes (see should_include_non_code_file in main.py)
+REFERENCE_EXTENSIONS = ['pdf', 'webp', 'png', 'jpg', 'jpeg', 'gif', 'svg', 'md', 'txt', 'json', 'xml', 'yaml', 'yml',
+                        'css', 'scss', 'sass', 'less', 'html', 'htm']
+# Non-code files that can reference assets themselves, so they are scanned like code
+REFERENCE_SOURCES = {'.css', '.scss', '.sass', '.less', '.html', '.htm'}
+# An extension at the end of a reference: followed by a quote, bracket, query, whitespace or the end
+_EXTENSION = re.compile(r"\.(?:%s)(?=[?#'\"`)\s,;]|$)" % '|'.join(sorted(REFERENCE_EXTENSIONS, key=len, reverse=True)),
+                        re.IGNORECASE)
+# Characters that end a reference on its left
+_DELIMITERS = ' \t\r\n\'"`(),;=<>{}[]|*\\'
+_MAX_REFERENCE = 512
+# An unquoted `url(...)`; quoted ones are string literals already
+_CSS_URL = re.compile(r"url\(\s*([^'\"()\s]+)\s*\)")
+
+
+def asset_references(code, spans=None):
+    """Asset-like references (paths or URLs ending in an asset extension) in the string literals and
+    `url(...)` of code, in order, without repeats. `spans` are scan_statements' spans of code if the
+    caller already scanned it."""
+    if not _EXTENSION.search(code):
+        return []
+    if spans is None:
+        spans = []
+        for _ in scan_statements(code, spans):
+            pass
+    regions = [(start, end) for kind, start, end in spans if kind == 'string']
+    if 'url(' in code:
+        comments = [(start, end) for kind, start, end in spans if kind == 'comment']
+        comment_starts = [start for start, end in comments]
+        for match in _CSS_URL.finditer(code):
+            i = bisect.bisect_right(comment_starts, match.start()) - 1
+            if i < 0 or comments[i][1] <= match.start():
+                regions.append(match.span(1))
+        regions.sort()
+    references = {}
+    for region_start, region_end in regions:
+        for match in _EXTENSION.finditer(code, region_start, region_end):
+            window_start = max(region_start, match.start() - _MAX_REFERENCE)
+            start = max(code.rfind(c, window_start, match.start()) for c in _DELIMITERS) + 1
+            if start == 0:
+                if window_start > region_start:
+                    continue  # No delimiter within reach: part of a blob, not a reference
+                start = region_start
+            reference = code[start:match.end()]
+            if len(reference) > len(match.group()) and '://' not in reference and not reference.startswith('data:'):
+                references[reference] = None
+    return list(references)
+
+
+class AssetIndex:
+    """Asset files by basename, for references that import resolution cannot place.
+
+    `public_dir` is the directory served at the site root ('/logo.png' is public/logo.png).
+    """
+
+    def __init__(self, files, public_dir=None):
+        self.public_dir = public_dir
+        self.by_name = {}
+        self.paths = {}
+        for file in files:
+            self.add_file(file)
+
+    def add_file(self, file):
+        if str(file) not in self.paths:
+            self.by_name.setdefault(file.name, []).append(file)
+            self.paths[str(file)] = file
+
+    def remove_file(self, file):
+        file = self.paths.pop(str(file), None)
+        if file is not None:
+            self.by_name[file.name].remove(file)
+            if not self.by_name[file.name]:
+                del self.by_name[file.name]
+
+    def resolve(self, reference, source_file, root_dir):
+        """Asset file a reference names, or None"""
+        reference = reference.split('?', 1)[0].split('#', 1)[0]
+        candidates = self.by_name.get(reference.rsplit('/', 1)[-1])
+        if not candidates:
+            return None
+        if reference.startswith('/'):
+            bases = [self.public_dir, root_dir]
+            reference = reference[1:]
+        else:
+            bases = [source_file.parent, root_dir, self.public_dir]
+        for base in bases:
+            if base is not None:
+                found = self.paths.get(os.path.normpath(os.path.join(base, reference)))
+                if found is not None:
+                    return found
+        # Built at runtime (`${base}/logo.png`) or aliased: only trust the name if it is unambiguous
+        return candidates[0] if len(candidates) == 1 else None
+
+
+def is_reference(import_path):
+    """Whether a specifier names an asset (and AssetIndex may resolve it)"""
+    return pathlib.PurePosixPath(import_path.split('?', 1)[0]).suffix[1:].lower() in REFERENCE_EXTENSIONS
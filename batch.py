@@ -0,0 +1,187 @@
+"""Batch mode: analyze many repos and write one aggregated, resumable report.
+
+Downloads run on a thread pool sharing the pooled HTTP session (at most PER_HOST_CONCURRENCY
+requests per host), analysis runs on a process pool. Each finished repo is appended to the
+report (NDJSON, or CSV when the path ends in .csv) and flushed to disk straight away; on
+restart, repos already reported as 'ok' are skipped and failed ones are retried.
+"""
+import csv
+import json
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import main
+import symbols
+from http_pool import session_request
+
+
+REPORT_FIELDS = ['repo', 'commit', 'status', 'code_files', 'other_files', 'nodes', 'edges',
+                 'connected', 'unused', 'unused_code', 'unused_ui', 'error', 'seconds']
+
+
+def parse_repo(line):
+    """'owner/repo' or a github.com URL -> 'owner/repo' (None for blank lines and comments)"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('https://github.com/'):
+        line = line[len('https://github.com/'):]
+    owner, repo = line.strip('/').split('/')[:2]
+    return f"{owner}/{repo.removesuffix('.git')}"
+
+
+def read_repo_list(path):
+    """Repos from a file (one per line), or from stdin when path is '-'"""
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    return [repo for repo in map(parse_repo, lines) if repo]
+
+
+def list_owner_repos(owner, github_token=None):
+    """All repos of a user or organization, following the API's pagination"""
+    headers = {'Accept': 'application/vnd.github+json'}
+    if github_token:
+        headers['Authorization'] = f'token {github_token}'
+    url = f"https://api.github.com/users/{owner}/repos?per_page=100&type=owner"
+    repos = []
+    while url:
+        response = session_request('GET', url, headers=headers, timeout=30)
+        response.raise_for_status()
+        repos.extend(item['full_name'] for item in response.json() if not item.get('archived'))
+        url = response.links.get('next', {}).get('url')
+    return repos
+
+
+def load_report(path):
+    """Return {repo: status} for the rows already in a report"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                done[row['repo']] = row['status']
+        else:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+                done[row['repo']] = row['status']
+    return done
+
+
+class ReportWriter:
+    """Appends rows to an NDJSON or CSV report, flushing each one to disk"""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_csv = path.endswith('.csv')
+        self._lock = threading.Lock()
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='')
+        if self.is_csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=REPORT_FIELDS)
+            if new_file:
+                self._writer.writeheader()
+
+    def write(self, row):
+        with self._lock:
+            if self.is_csv:
+                self._writer.writerow(row)
+            else:
+                self._file.write(json.dumps(row) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def analyze_checkout(repo_dir, assets, graph_key=None, extractor=None, use_cache=True, with_symbols=False):
+    """Build the import graph of a downloaded repo and count unused files (runs in a pool worker).
+    `with_symbols` is passed in rather than read from symbols.SYMBOL_ANALYSIS: spawned workers do not
+    inherit the parent's setting, and the graph must match the mode graph_key was built for."""
+    cache = main.get_analysis_cache() if use_cache else None
+    payload = cache.get_graph(graph_key) if cache and graph_key else None
+    if payload:
+        graph = main.graph_from_payload(payload)
+    else:
+        graph = main.build_repo_graph(repo_dir, assets, workers=1, extractor=extractor, cache=cache,
+                                      with_symbols=with_symbols)
+        if cache and graph_key:
+            cache.put_graph(graph_key, main.graph_to_payload(graph))
+    reachability = main.find_unused(graph)
+    unused_code = [node for node in reachability['unused']
+                   if pathlib.PurePath(node).suffix.lower() in main.CODE_EXTENSIONS]
+    code_files = sum(1 for node in graph if pathlib.PurePath(node).suffix.lower() in main.CODE_EXTENSIONS)
+    return {
+        'code_files': code_files,
+        'other_files': graph.number_of_nodes() - code_files,
+        'nodes': graph.number_of_nodes(),
+        'edges': graph.number_of_edges(),
+        'connected': len(reachability['connected']),
+        'unused': len(reachability['unused']),
+        'unused_code': len(unused_code),
+        'unused_ui': sum(1 for node in unused_code if 'components/ui' in node.lower()),
+    }
+
+
+def run_batch(repos, report_path, github_token=None, download_workers=4, analysis_workers=0, extractor=None,
+              use_cache=True, with_symbols=None):
+    """Analyze repos ('owner/repo'), appending one row per repo to report_path. Returns a status count.
+    `with_symbols` selects symbol mode (default: symbols.SYMBOL_ANALYSIS)."""
+    extractor = extractor or main.IMPORT_EXTRACTOR
+    with_symbols = symbols.SYMBOL_ANALYSIS if with_symbols is None else with_symbols
+    previous = load_report(report_path)
+    pending = [repo for repo in dict.fromkeys(repos) if previous.get(repo) != 'ok']
+    print(f"Batch: {len(pending)} repos to analyze, {len(set(repos)) - len(pending)} already in {report_path}")
+    counts = {'ok': 0, 'error': 0}
+    if not pending:
+        return counts
+
+    writer = ReportWriter(report_path)
+    analysis_pool = ProcessPoolExecutor(max_workers=analysis_workers or os.cpu_count() or 1)
+
+    def process(repo):
+        start = time.perf_counter()
+        row = dict.fromkeys(REPORT_FIELDS)
+        row['repo'] = repo
+        temp_dir = pathlib.Path(tempfile.mkdtemp(prefix='zombie_batch_'))
+        try:
+            repo_dir, assets, commit = main.download_repo(f"https://github.com/{repo}", temp_dir, github_token)
+            row['commit'] = commit
+            graph_key = main.graph_cache_key(repo, commit, extractor, with_symbols) if commit else None
+            # Downloading threads wait here, so at most download_workers checkouts are on disk
+            row.update(analysis_pool.submit(analyze_checkout, repo_dir, assets, graph_key, extractor, use_cache,
+                                            with_symbols).result())
+            row['status'] = 'ok'
+        except Exception as e:
+            row['status'] = 'error'
+            row['error'] = str(e).splitlines()[0] if str(e) else type(e).__name__
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        row['seconds'] = round(time.perf_counter() - start, 3)
+        writer.write(row)
+        return row
+
+    try:
+        with ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix='download') as downloads:
+            for i, row in enumerate(downloads.map(process, pending), 1):
+                counts[row['status']] += 1
+                detail = f"{row['unused']} unused of {row['nodes']}" if row['status'] == 'ok' else row['error']
+                print(f"[{i}/{len(pending)}] {row['repo']}: {detail} ({row['seconds']}s)")
+    finally:
+        analysis_pool.shutdown()
+        writer.close()
+    print(f"Batch finished: {counts['ok']} ok, {counts['error']} failed; report at {report_path}")
+    return counts
@@ -0,0 +1,62 @@
+"""Compare import extractor engines on worst-case inputs and on a generated repo.
+
+Each worst-case input is timed at doubling sizes: a linear engine roughly doubles,
+a backtracking one roughly quadruples.
+
+Usage: python benchmarks/bench_extractors.py [engine ...]
+"""
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from extractors import EXTRACTORS  # noqa: E402
+from synthetic import generate_repo  # noqa: E402
+
+
+WORST_CASES = {
+    # Minified bundle: one line full of `import`/`export` tokens with no `from`
+    'minified import tokens': lambda n: 'var a="x";' + 'import a,b,c ' * n,
+    'minified export tokens': lambda n: 'export ' * n,
+    # Generated supabase types.ts: long, import-free, nested object types
+    'generated types.ts': lambda n: 'export type Database = {\n'
+                                    + '  public: { Tables: { t: { Row: { id: string; name: string | null } } } }\n' * n
+                                    + '}\n',
+    # Long line of regex-literal lookalikes
+    'division/regex ambiguity': lambda n: 'x = (' + ' a / b /' * n + ')\n',
+    # Templates nested n deep through `${...}` substitutions
+    'nested templates': lambda n: 'const a = ' + '`${' * n + "import('./deep')" + '}`' * n + ';\n',
+}
+SIZES = [1000, 2000, 4000, 8000]
+
+
+def timed(extractor, code):
+    start = time.perf_counter()
+    extractor(code)
+    return time.perf_counter() - start
+
+
+def main():
+    engines = sys.argv[1:] or ['regex', 'scanner']
+    print(f"{'input':<26} {'size':>6} " + ' '.join(f"{engine:>12}" for engine in engines))
+    for name, make in WORST_CASES.items():
+        for size in SIZES:
+            code = make(size)
+            print(f"{name:<26} {size:>6} " + ' '.join(f"{timed(EXTRACTORS[e], code):>11.4f}s" for e in engines))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        src = generate_repo(temp_dir, 2000)
+        codes = [path.read_text() for path in src.rglob('*.ts*')]
+        totals = []
+        for engine in engines:
+            start = time.perf_counter()
+            for code in codes:
+                EXTRACTORS[engine](code)
+            totals.append(time.perf_counter() - start)
+        print(f"{'generated repo':<26} {len(codes):>6} " + ' '.join(f"{t:>11.4f}s" for t in totals))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare reachability on the networkx graph with the compact ImportGraph.
+
+Builds a random layered import graph (entry point at the root, a few target files),
+then times find_unused-style queries and measures the memory each graph holds.
+
+Usage: python benchmarks/bench_graph.py [n_files ...]
+"""
+import pathlib
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import networkx as nx  # noqa: E402
+
+from import_graph import ImportGraph  # noqa: E402
+
+
+def random_edges(n_files, imports_per_file=6, seed=0):
+    rng = random.Random(seed)
+    paths = ['main.tsx'] + [f"components/dir{i % 97}/Component{i}.tsx" for i in range(1, n_files)]
+    edges = []
+    for i in range(n_files - 1):
+        # Imports mostly point "down" the tree, so a few files stay unreachable
+        for _ in range(imports_per_file):
+            edges.append((paths[i], paths[rng.randrange(i + 1, n_files)]))
+    return paths, edges
+
+
+def measure(build):
+    """Build twice: once timed, once under tracemalloc (which slows it down) for the retained size"""
+    start = time.perf_counter()
+    graph = build()
+    elapsed = time.perf_counter() - start
+    del graph
+    tracemalloc.start()
+    graph = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, elapsed, size
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [5000, 20000, 50000]
+    print(f"{'files':>7} {'graph':>9} {'build s':>8} {'MB':>7} {'query s':>8}")
+    for n_files in sizes:
+        paths, edges = random_edges(n_files)
+        targets = paths[1:len(paths):len(paths) // 4]
+
+        def build_nx():
+            graph = nx.DiGraph()
+            graph.add_nodes_from(paths)
+            graph.add_edges_from(edges, dir='back')
+            return graph
+
+        graph, build_s, size = measure(build_nx)
+        start = time.perf_counter()
+        connected = nx.descendants(graph, 'main.tsx') | {'main.tsx'}
+        for target in targets:
+            nx.descendants(graph, target)
+        query_s = time.perf_counter() - start
+        print(f"{n_files:>7} {'networkx':>9} {build_s:>8.3f} {size / 2**20:>7.1f} {query_s:>8.3f}")
+
+        def build_compact():
+            graph = ImportGraph.from_edges(paths, edges)
+            graph.number_of_edges()  # compact now so it is counted in build time
+            return graph
+
+        graph, build_s, size = measure(build_compact)
+        start = time.perf_counter()
+        masks = graph.reach([['main.tsx']] + [[target] for target in targets])
+        query_s = time.perf_counter() - start
+        assert {path for path, mask in zip(graph.paths, masks) if mask & 1} == connected
+        print(f"{n_files:>7} {'compact':>9} {build_s:>8.3f} {size / 2**20:>7.1f} {query_s:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark serial vs pooled import extraction as file count and worker count grow.
+
+Usage: python benchmarks/bench_parallel.py [n_files ...]
+"""
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from main import scan_imports  # noqa: E402
+from path_index import PathIndex  # noqa: E402
+from synthetic import generate_repo  # noqa: E402
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [500, 2000, 8000]
+    cpus = os.cpu_count() or 1
+    runs = [('serial', 1)] + [(pool, w) for pool in ('thread', 'process') for w in sorted({2, 4, cpus}) if w > 1]
+    print(f"{cpus} CPUs available")
+    print(f"{'files':>7} {'pool':>8} {'workers':>7} {'seconds':>8} {'speedup':>7}")
+    for n_files in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            src = generate_repo(temp_dir, n_files)
+            code_files = [f for f in PathIndex(src).files if f.suffix in ('.ts', '.tsx')]
+            baseline = None
+            for pool, workers in runs:
+                start = time.perf_counter()
+                results = list(scan_imports(code_files, workers, pool))
+                elapsed = time.perf_counter() - start
+                assert len(results) == len(code_files)
+                baseline = baseline or elapsed
+                print(f"{n_files:>7} {pool:>8} {workers:>7} {elapsed:>8.3f} {baseline / elapsed:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
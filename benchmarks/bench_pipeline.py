@@ -0,0 +1,168 @@
+"""End-to-end pipeline benchmark on generated Lovable-shaped projects, fully offline.
+
+Runs find_src_directory and analyze_repository (walk, scan, resolve, reachability, DOT and
+rendering) against synthetic repos of each size, with the Blob upload stubbed out. Rendering
+uses the local Graphviz `dot` binary when installed and is stubbed otherwise. For every
+stage it records wall time, peak Python memory and syscall counts (read/write syscalls from
+/proc/self/io, Linux only); `--save` writes them as a JSON baseline and `--compare` fails
+when a later run regresses past the tolerance.
+
+Usage: python benchmarks/bench_pipeline.py [n_files ...] [--save FILE] [--compare FILE]
+"""
+import argparse
+import contextlib
+import json
+import os
+import pathlib
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import ingest  # noqa: E402
+import main  # noqa: E402
+import metrics  # noqa: E402
+from synthetic import generate_lovable_repo  # noqa: E402
+
+
+# A stage regresses when it is this much worse than the baseline and above the noise floor
+NOISE_FLOOR = {'seconds': 0.05, 'peak_mb': 1.0, 'syscalls': 50}
+
+
+def syscall_count():
+    """Read + write syscalls made by this process so far (None where /proc/self/io is unavailable)"""
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+    except OSError:
+        return None
+    return int(fields['syscr']) + int(fields['syscw'])
+
+
+def measure(function, repeat=3, memory=True):
+    """Time function (best of `repeat` runs, with syscall counts), then run it once under tracemalloc
+    for peak memory. Returns (result, stats, stages): the pipeline's own stage timings of the best run."""
+    best = None
+    for _ in range(repeat):
+        metrics.reset()
+        metrics.enable()
+        syscalls = syscall_count()
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        after = syscall_count()
+        metrics.enable(False)
+        if best is None or seconds < best[0]:
+            best = (seconds, after - syscalls if syscalls is not None else None, metrics.snapshot())
+    seconds, syscalls, stages = best
+    stats = {'seconds': round(seconds, 4), 'syscalls': syscalls}
+    if memory:
+        tracemalloc.start()
+        function()
+        stats['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    return result, stats, stages
+
+
+def bench_size(n_files, seed, repeat, memory):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        repo_dir = generate_lovable_repo(temp_dir, n_files, seed)
+        generate_seconds = time.perf_counter() - start
+        results = {}
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            src_dir, results['find_src'], _ = measure(lambda: main.find_src_directory(repo_dir), repeat, memory)
+            graph = main.build_import_graph(src_dir)
+            _, results['analyze'], stages = measure(lambda: main.analyze_repository(src_dir, 'bench', 'bench.svg'),
+                                                    repeat, memory)
+        # Sub-stages of analyze_repository, from the instrumented pipeline
+        for name, totals in stages.items():
+            results[name] = {'seconds': round(totals['seconds'], 4)}
+        return {
+            'nodes': graph.number_of_nodes(),
+            'edges': graph.number_of_edges(),
+            'generate_seconds': round(generate_seconds, 2),
+            'stages': results,
+        }
+
+
+def compare(baseline, current, tolerance):
+    """Return a list of regression messages (empty when every shared measurement is within tolerance)"""
+    regressions = []
+    for size, run in current['results'].items():
+        old_run = baseline.get('results', {}).get(size)
+        if old_run is None:
+            continue
+        for stage_name, stats in run['stages'].items():
+            old_stats = old_run['stages'].get(stage_name, {})
+            for key, floor in NOISE_FLOOR.items():
+                new, old = stats.get(key), old_stats.get(key)
+                if new is None or old is None:
+                    continue
+                if new > old * (1 + tolerance) and new - old > floor:
+                    regressions.append(f"{size} files, {stage_name}: {key} {old} -> {new}")
+    return regressions
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sizes', nargs='*', type=int, default=[100, 1000, 10000],
+                        help='code files per generated repo (up to 100000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--renderer', default='auto',
+                        help="render backend; 'auto' uses dot if installed, 'none' skips rendering")
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage; the fastest is kept')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--save', metavar='FILE', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare against a saved baseline, exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown/growth (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    renderer = args.renderer
+    if renderer == 'auto':
+        renderer = 'dot' if shutil.which('dot') else 'none'
+    if renderer == 'none':
+        main.dot_to_svg = lambda dot_code, backend=None: '<svg xmlns="http://www.w3.org/2000/svg"/>'
+    else:
+        main.RENDER_BACKEND = renderer
+    main.upload_svg_to_vercel_blob = lambda filename, svg: f"file://{filename}"
+
+    current = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'renderer': renderer,
+        'extractor': main.IMPORT_EXTRACTOR,
+        'results': {},
+    }
+    print(f"renderer: {renderer}")
+    print(f"{'files':>7} {'nodes':>7} {'stage':<13} {'seconds':>8} {'peak MB':>8} {'syscalls':>9}")
+    for n_files in args.sizes:
+        result = current['results'][str(n_files)] = bench_size(n_files, args.seed, args.repeat, not args.no_memory)
+        for stage_name, stats in result['stages'].items():
+            print(f"{n_files:>7} {result['nodes']:>7} {stage_name:<13} {stats['seconds']:>8.3f} "
+                  f"{stats.get('peak_mb', ''):>8} {stats.get('syscalls') if stats.get('syscalls') is not None else '':>9}")
+    peak = ingest.peak_rss_mb()
+    current['peak_rss_mb'] = round(peak, 1) if peak is not None else None
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == '__main__':
+    run()
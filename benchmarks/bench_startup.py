@@ -0,0 +1,115 @@
+"""Cold-start benchmark for the web entry point: what `import app` loads and how long it takes.
+
+Each run starts a fresh interpreter, as a serverless cold start does. It imports the app
+under `python -X importtime` and then times the first request to `/` and to a cached
+`/<username>/<repo>`. The cached result is seeded into a throwaway RESULT_CACHE_DIR, so the
+run is offline. The check fails (exit 1) when the app imports a module that only analysis
+needs, or when the app's own import time goes over the budget. Flask and Werkzeug are not
+counted against the budget: the app cannot avoid them.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--budget MS]
+"""
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Loaded by the first request that analyzes, never by a cold start
+LAZY_MODULES = ['main', 'networkx', 'requests', 'pydot', 'graphviz', 'ingest', 'extractors', 'import_graph',
+                'analysis_cache', 'http_pool', 'workspaces']
+# Import time (ms) the app may add on top of Flask and Werkzeug
+DEFAULT_BUDGET_MS = 40
+FRAMEWORK_PACKAGES = ('flask', 'werkzeug')
+
+# Runs in the fresh interpreter: import the app, then serve `/` and a cache hit
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+landing = client.get('/')
+served = time.perf_counter()
+app.RESULT_CACHE.put(app.svg_result_key('owner', 'repo'), '<svg xmlns="http://www.w3.org/2000/svg"/>')
+cached_start = time.perf_counter()
+cached = client.get('/owner/repo')
+cached_end = time.perf_counter()
+assert landing.status_code == 200 and cached.status_code == 200, (landing.status_code, cached.status_code)
+print(json.dumps({'import_ms': (imported - start) * 1000, 'landing_ms': (served - imported) * 1000,
+                  'cached_ms': (cached_end - cached_start) * 1000, 'modules': sorted(sys.modules)}))
+'''
+
+
+def parse_importtime(stderr):
+    """{module: (self µs, cumulative µs)} from `python -X importtime` output, and
+    {top-level module: {direct import: cumulative µs}}"""
+    modules, children, pending = {}, {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2  # a module is printed after the ones it imports
+        name = name.strip()
+        modules[name] = (int(self_us), int(cumulative_us))
+        if depth == 1:
+            pending[name] = int(cumulative_us)
+        elif depth == 0:
+            children[name], pending = pending, {}
+    return modules, children
+
+
+def cold_start():
+    """One fresh interpreter: (timings from CHILD, importtime table)"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {**os.environ, 'RESULT_CACHE_DIR': cache_dir, 'PYTHONDONTWRITEBYTECODE': '1'}
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def app_import_ms(importtime):
+    """Cumulative import time of `app`, minus what its direct Flask/Werkzeug imports pulled in"""
+    modules, children = importtime
+    framework = sum(cumulative for name, cumulative in children['app'].items()
+                    if name.split('.')[0] in FRAMEWORK_PACKAGES)
+    return (modules['app'][1] - framework) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to start (median is reported)')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'ms the app may import on top of Flask (default {DEFAULT_BUDGET_MS})')
+    args = parser.parse_args()
+
+    runs = [cold_start() for _ in range(args.runs)]
+    timings = {key: statistics.median(run[key] for run, _ in runs) for key in ('import_ms', 'landing_ms', 'cached_ms')}
+    own_ms = statistics.median(app_import_ms(importtime) for _, importtime in runs)
+    print(f"import app          {timings['import_ms']:8.1f} ms   (app's own share {own_ms:.1f} ms, budget {args.budget:g})")
+    print(f"first GET /         {timings['landing_ms']:8.1f} ms")
+    print(f"first cached GET    {timings['cached_ms']:8.1f} ms")
+
+    _, (modules, _) = runs[-1]
+    print('\nslowest imports (cumulative ms):')
+    for name, (_, cumulative) in sorted(modules.items(), key=lambda item: -item[1][1])[:10]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    failures = []
+    loaded = [name for name in LAZY_MODULES if name in runs[-1][0]['modules']]
+    if loaded:
+        failures.append(f"cold start imports {', '.join(loaded)}")
+    if own_ms > args.budget:
+        failures.append(f"app import takes {own_ms:.1f} ms on top of Flask, budget is {args.budget:g} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
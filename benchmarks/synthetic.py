@@ -0,0 +1,167 @@
+"""Generate synthetic Lovable-shaped React/TS projects for benchmarks."""
+import os
+import pathlib
+import random
+
+
+DIRS = ['pages', 'components', 'components/ui', 'hooks', 'lib', 'integrations/supabase']
+
+
+def generate_repo(root, n_files=1000, imports_per_file=6, seed=0):
+    """Write a project with `n_files` code files under root/src and return the src directory"""
+    rng = random.Random(seed)
+    src = pathlib.Path(root) / 'src'
+    for d in DIRS:
+        (src / d).mkdir(parents=True, exist_ok=True)
+    (src.parent / 'package.json').write_text('{"dependencies": {"react": "^18.0.0"}}')
+
+    files = [src / rng.choice(DIRS) / f"Component{i}{rng.choice(['.tsx', '.ts'])}" for i in range(n_files)]
+    (src / 'main.tsx').write_text('import App from "./App"\n')
+    (src / 'App.tsx').write_text(f'import Root from "@/{files[0].relative_to(src).with_suffix("")}"\n')
+    for i, path in enumerate(files):
+        lines = ["import React from 'react';"]
+        for target in rng.sample(files, min(imports_per_file, len(files))):
+            rel = os.path.relpath(target.with_suffix(''), path.parent)
+            lines.append(f"import {{ {target.stem} }} from '{rel if rel.startswith('.') else './' + rel}';")
+        lines.append(f"export const {path.stem} = () => <div>{'x' * rng.randint(100, 2000)}</div>;")
+        path.write_text('\n'.join(lines) + '\n')
+    return src
+
+
+UI_COMPONENTS = ['accordion', 'alert', 'alert-dialog', 'avatar', 'badge', 'button', 'calendar', 'card', 'carousel',
+                 'checkbox', 'command', 'dialog', 'dropdown-menu', 'form', 'input', 'label', 'popover', 'select',
+                 'separator', 'sheet', 'sidebar', 'skeleton', 'slider', 'sonner', 'switch', 'table', 'tabs',
+                 'textarea', 'toast', 'toaster', 'toggle', 'tooltip']
+ASSET_TYPES = {'.png': b'\x89PNG\r\n\x1a\n' + bytes(256), '.svg': b'<svg xmlns="http://www.w3.org/2000/svg"/>',
+               '.css': b'.x { color: red; }\n', '.md': b'# Notes\n'}
+
+
+def _import_line(name, specifier):
+    return f"import {{ {name} }} from '{specifier}';"
+
+
+def _relative(target, source_dir):
+    rel = os.path.relpath(target, source_dir)
+    return rel if rel.startswith('.') else './' + rel
+
+
+def generate_lovable_repo(root, n_files=1000, seed=0, long_lines=True):
+    """Write a Lovable-shaped project with about `n_files` code files and return the repo root.
+
+    Contains what real projects do: `@/` alias imports, a shadcn `components/ui` tree
+    (mostly unused), feature folders behind barrel `index.ts` files, assets and CSS,
+    dead subtrees nothing imports, a `node_modules`/`dist` full of noise, a generated
+    Supabase types file and (with long_lines) minified files with pathological long lines.
+    """
+    rng = random.Random(seed)
+    root = pathlib.Path(root)
+    src = root / 'src'
+
+    def write(path, text):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text) if isinstance(text, str) else path.write_bytes(text)
+
+    write(root / 'package.json', '{"dependencies": {"react": "^18.3.1", "@radix-ui/react-slot": "^1.1.0"},'
+                                 ' "devDependencies": {"typescript": "^5.5.3", "vite": "^5.4.1"}}')
+    write(root / 'tsconfig.json', '{"compilerOptions": {"baseUrl": ".", "paths": {"@/*": ["./src/*"]}}}')
+    write(root / 'README.md', '# Welcome to your Lovable project\n')
+
+    # Budget: ~10% pages, ~5% hooks/lib, ~10% dead subtrees, rest feature components
+    n_ui = min(len(UI_COMPONENTS), max(4, n_files // 20))
+    n_pages = max(1, n_files // 10)
+    n_hooks = max(1, n_files // 20)
+    n_dead = max(1, n_files // 10)
+    n_features = max(1, n_files - n_ui - n_pages - n_hooks - n_dead - 8)
+    per_folder = 12
+
+    ui = [src / 'components' / 'ui' / f"{name}.tsx" for name in UI_COMPONENTS[:n_ui]]
+    for i, path in enumerate(ui):
+        lines = ["import * as React from 'react';", "import { cn } from '@/lib/utils';"]
+        for sibling in rng.sample(ui[:i], min(2, i)):
+            lines.append(_import_line('Part', f"./{sibling.stem}"))
+        lines.append(f"export const {path.stem.title().replace('-', '')} = () => null;")
+        write(path, '\n'.join(lines) + '\n')
+    write(src / 'lib' / 'utils.ts', "export function cn(...inputs: string[]) { return inputs.join(' '); }\n")
+
+    hooks = [src / 'hooks' / f"use-thing{i}.ts" for i in range(n_hooks)]
+    for i, path in enumerate(hooks):
+        lines = ["import { useState } from 'react';"]
+        if i and rng.random() < 0.5:
+            lines.append(_import_line('x', f"@/hooks/{hooks[rng.randrange(i)].stem}"))
+        lines.append(f"export function {path.stem.replace('-', '_')}() {{ return useState(0); }}")
+        write(path, '\n'.join(lines) + '\n')
+
+    # Feature components live in folders re-exported by a barrel index.ts
+    features = [src / 'components' / f"feature{i // per_folder}" / f"Widget{i}.tsx" for i in range(n_features)]
+    folders = sorted({path.parent for path in features})
+    for i, path in enumerate(features):
+        lines = ["import React from 'react';"]
+        # Only the first third of the UI kit is ever used, like most generated projects
+        used_ui = ui[:max(2, len(ui) // 3)]
+        for name in rng.sample(used_ui, min(2, len(used_ui))):
+            lines.append(_import_line('X', f"@/components/ui/{name.stem}"))
+        if i and rng.random() < 0.7:
+            target = features[rng.randrange(max(0, i - 40), i)]
+            spec = _relative(target.with_suffix(''), path.parent) if rng.random() < 0.5 else \
+                f"@/{target.relative_to(src).with_suffix('').as_posix()}"
+            lines.append(_import_line(target.stem, spec))
+        if hooks and rng.random() < 0.3:
+            lines.append(_import_line('hook', f"@/hooks/{rng.choice(hooks).stem}"))
+        lines.append(f"export const {path.stem} = () => <div>{'x' * rng.randint(50, 1500)}</div>;")
+        write(path, '\n'.join(lines) + '\n')
+    barrels = {}
+    for path in features:
+        barrels.setdefault(path.parent, []).append(f"export * from './{path.stem}';")
+    for folder, exports in barrels.items():
+        write(folder / 'index.ts', '\n'.join(exports) + '\n')
+
+    # Pages import feature folders through their barrels
+    pages = [src / 'pages' / f"Page{i}.tsx" for i in range(n_pages)]
+    for path in pages:
+        lines = ["import React from 'react';"]
+        for folder in rng.sample(folders, min(3, len(folders))):
+            lines.append(_import_line('Widget', f"@/components/{folder.name}"))
+        lines.append(f"export default function {path.stem}() {{ return null; }}")
+        write(path, '\n'.join(lines) + '\n')
+
+    # Dead subtrees: folders whose files only import each other
+    dead = [src / 'components' / 'legacy' / f"old{i // per_folder}" / f"Old{i}.tsx" for i in range(n_dead)]
+    for i, path in enumerate(dead):
+        lines = ["import React from 'react';"]
+        if i % per_folder:
+            lines.append(_import_line('Prev', f"./{dead[i - 1].stem}"))
+        lines.append(f"export const {path.stem} = () => null;")
+        write(path, '\n'.join(lines) + '\n')
+
+    # Entry points, supabase client and generated types
+    routes = '\n'.join(f"import {path.stem} from '@/pages/{path.stem}';" for path in pages)
+    write(src / 'App.tsx', "import { Toaster } from '@/components/ui/toaster';\n" + routes + '\n'
+          + "export default function App() { return null; }\n")
+    write(src / 'main.tsx', "import { createRoot } from 'react-dom/client';\nimport App from './App.tsx';\n"
+                            "import './index.css';\ncreateRoot(document.getElementById('root')!).render(<App />);\n")
+    write(src / 'integrations' / 'supabase' / 'client.ts',
+          "import type { Database } from './types';\nexport const supabase = null;\n")
+    write(src / 'integrations' / 'supabase' / 'types.ts', 'export type Database = {\n'
+          + '  public: { Tables: { t: { Row: { id: string; name: string | null } } } }\n' * max(10, n_files // 10)
+          + '}\n')
+    write(src / 'vite-env.d.ts', '/// <reference types="vite/client" />\n')
+
+    # Assets: imported stylesheet, referenced images, stray docs
+    write(src / 'index.css', ASSET_TYPES['.css'])
+    for i in range(max(4, n_files // 25)):
+        ext = rng.choice(list(ASSET_TYPES))
+        write(src / 'assets' / f"asset{i}{ext}", ASSET_TYPES[ext])
+
+    if long_lines:
+        # Minified bundle and a data blob: single lines of hundreds of KB full of import-like tokens
+        write(src / 'lib' / 'vendor.min.js', 'var a="x";' + 'import a,b,c ' * 20000 + '\n')
+        write(src / 'lib' / 'data.ts', 'export const DATA = [' + ','.join(f'"/a/b{i}"' for i in range(30000)) + '];\n')
+
+    # node_modules and build output: never analyzed, but on disk
+    for i in range(max(10, n_files // 2)):
+        package = root / 'node_modules' / f"pkg{i // 20}"
+        write(package / f"file{i}.js", "module.exports = require('./index');\n")
+        if i % 20 == 0:
+            write(package / 'package.json', '{"name": "pkg"}')
+    write(root / 'dist' / 'assets' / 'index-abc123.js', 'import"./x.js";' * 5000 + '\n')
+    return root
@@ -0,0 +1,276 @@
+"""Import extractor engines: find the module specifiers a JS/TS file depends on.
+
+Engines:
+  scanner      single-pass lexer (default); skips comments, strings and regex literals
+  tree-sitter  syntax-tree based, needs the optional tree-sitter packages
+  regex        the original three-pattern extractor, kept for comparison
+"""
+import re
+
+
+REGEX_PATTERNS = [
+    r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',  # import ... from "path"
+    r'import\s+[\'"]([^\'"]+)[\'"]',                # import "path"
+    r'export\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',  # export ... from "path"
+]
+
+
+def regex_imports(code):
+    """Extract import paths with the original three regex passes"""
+    imports = []
+    for pattern in REGEX_PATTERNS:
+        imports.extend(re.findall(pattern, code, re.MULTILINE))
+    return imports
+
+
+# Positions the scanner has to look at; all other text is skipped by the regex engine in C.
+_TOKEN_START = re.compile(r"""import|export|require|[/'"`]""")
+# Inside a `${...}` substitution braces are tokens too: the `}` that closes it resumes the template
+_SUBSTITUTION_TOKEN_START = re.compile(r"""import|export|require|[/'"`{}]""")
+_STRING = re.compile(r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'" r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"')
+_TEMPLATE = re.compile(r"`[^`\\]*(?:\\[\s\S][^`\\]*)*`")
+_REGEX_LITERAL = re.compile(r"/(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*")
+_REGEX_LITERAL_MAX = 4096  # bounds the cost of a '/' that turns out not to start a literal
+# Characters and keywords after which a '/' starts a regex literal rather than a division.
+# Not '<': that is a closing tag (`</div>`) in JSX and HTML far more often than `a < /re/`.
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new', 'delete', 'void', 'throw',
+                   'yield', 'await'}
+# Inside a template literal: an escape, the closing backtick or a `${` substitution
+_TEMPLATE_PART = re.compile(r"\\[\s\S]|`|\$\{")
+# Bindings between `import`/`export` and `from`: identifiers, braces, commas, `*`, `as`, `type`
+_CLAUSE = re.compile(r"[\w$\s{},*]*")
+_SPECIFIER = re.compile(r"""\s*(?:'([^'\\\n]*)'|"([^"\\\n]*)")""")
+_CALL_SPECIFIER = re.compile(r"""\s*\(\s*(?:'([^'\\\n]*)'|"([^"\\\n]*)"|`([^`$\\]*)`)""")
+# `import`/`export` as a word inside a clause
+_CLAUSE_KEYWORD = re.compile(r"(?<![\w$.])(?:import|export)(?![\w$])")
+
+
+def _specifier(match):
+    return next(group for group in match.groups() if group is not None)
+
+
+def _keyword_before(code, end):
+    """Whether code[:end + 1] ends with one of _REGEX_KEYWORDS (and not a property named like one)"""
+    start = end
+    while start >= 0 and end - start < 10 and (code[start].isalnum() or code[start] in '_$'):
+        start -= 1
+    return code[start + 1:end + 1] in _REGEX_KEYWORDS and (start < 0 or code[start] not in '_$.')
+
+
+def _ends_with_from(clause):
+    clause = clause.rstrip()
+    return clause.endswith('from') and (len(clause) == 4 or not (clause[-5].isalnum() or clause[-5] in '_$'))
+
+
+def scan_statements(code, spans=None):
+    """Yield the import-like statements of a file in a single linear pass.
+
+    Comments, strings and regex literals are skipped. Each `import`, `export` or `require`
+    keyword gives (keyword, start, end, form, clause, specifier), code[start:end] being the
+    statement:
+      'from'  static import or re-export (including multi-line clauses); clause is the text
+              between the keyword and `from`
+      'bare'  side-effect import
+      'call'  dynamic `import()` (e.g. inside React.lazy) or `require()`
+      None    any other use of the keyword (`export const a`, `export { a }`); end, clause
+              and specifier are None
+
+    With a `spans` list, also appends ('string', start, end) for the text of each string and
+    template literal (template text only, not its substitutions) and ('comment', start, end) for
+    each comment. Specifiers consumed by a statement above are not included.
+    """
+    pos = 0
+    failed_clause_end = -1
+    # Brace depth of each open `${...}` substitution, innermost last. Substitutions are code
+    # (`${await import('./x')}`) and are scanned in place, however deeply templates nest.
+    substitutions = []
+    in_template = False  # code[pos] is template text rather than code
+    search = _TOKEN_START.search
+    while True:
+        if in_template:
+            match = _TEMPLATE_PART.search(code, pos)
+            if spans is not None:
+                text_end = len(code) if match is None else match.start()
+                if text_end > pos:
+                    spans.append(('string', pos, text_end))
+            if match is None:  # unterminated template runs to the end of the file
+                return
+            pos = match.end()
+            if match.group() == '${':
+                substitutions.append(0)
+                search = _SUBSTITUTION_TOKEN_START.search
+                in_template = False
+            elif match.group() == '`':
+                in_template = False
+            continue
+        match = search(code, pos)
+        if match is None:
+            return
+        start = match.start()
+        pos = match.end()
+        char = code[start]
+
+        if char == '/':
+            following = code[pos:pos + 1]
+            # `://` is a URL in a stylesheet (`url(https://...)`), not a comment
+            if following == '*' or (following == '/' and code[start - 1:start] != ':'):
+                end = code.find('\n' if following == '/' else '*/', pos + 1)
+                if spans is not None:
+                    spans.append(('comment', start, len(code) if end < 0 else end))
+                if end < 0:  # comment runs to the end of the file
+                    return
+                pos = end + 1 if following == '/' else end + 2
+            elif following != '>':  # `/>` ends a JSX or HTML tag
+                before = start - 1
+                while before >= 0 and code[before] in ' \t\r\n':
+                    before -= 1
+                # `url(/img.png)` in a stylesheet is a path
+                if (before < 0 or code[before] in _REGEX_PRECEDERS or _keyword_before(code, before)) and \
+                        not (before >= 0 and code[before] == '(' and code.endswith('url', 0, before)):
+                    literal = _REGEX_LITERAL.match(code, start, start + _REGEX_LITERAL_MAX)
+                    if literal:
+                        pos = literal.end()
+            continue
+        if char in '\'"`':
+            literal = (_TEMPLATE if char == '`' else _STRING).match(code, start)
+            if literal and (char != '`' or '${' not in literal.group()):
+                pos = literal.end()
+                if spans is not None:
+                    spans.append(('string', start + 1, pos - 1))
+            elif literal:
+                in_template = True  # has substitutions: scan the template text from after the backtick
+            continue
+        if char == '{':
+            substitutions[-1] += 1
+            continue
+        if char == '}':
+            if substitutions[-1]:
+                substitutions[-1] -= 1
+            else:
+                substitutions.pop()
+                if not substitutions:
+                    search = _TOKEN_START.search
+                in_template = True
+            continue
+
+        # Keywords must not be part of a longer identifier or a property access
+        if (start and (code[start - 1].isalnum() or code[start - 1] in '_$.')) or \
+                code[pos:pos + 1].isalnum() or code[pos:pos + 1] in ('_', '$'):
+            continue
+        keyword = match.group()
+        if keyword in ('import', 'require'):
+            call = _CALL_SPECIFIER.match(code, pos)
+            if call:
+                yield keyword, start, call.end(), 'call', None, _specifier(call)
+                pos = call.end()
+                continue
+            if keyword == 'require':
+                continue
+            bare = _SPECIFIER.match(code, pos)
+            if bare:
+                yield keyword, start, bare.end(), 'bare', None, _specifier(bare)
+                pos = bare.end()
+                continue
+
+        # A clause run ends at the same place from any start inside it, so one that
+        # already failed to end in `from` is not rescanned (keeps the pass linear).
+        if pos < failed_clause_end:
+            yield keyword, start, None, None, None, None
+            continue
+        clause = _CLAUSE.match(code, pos)
+        if _ends_with_from(clause.group()):
+            source = _SPECIFIER.match(code, clause.end())
+            if source:
+                text = clause.group().rstrip()[:-len('from')]
+                # Without semicolons a clause can run on from an earlier statement
+                # (`export default A` + newline + `export { B } from`): the last keyword starts it
+                clause_start = 0
+                inner_keywords = _CLAUSE_KEYWORD.finditer(text) if 'import' in text or 'export' in text else ()
+                for inner in inner_keywords:
+                    yield keyword, start, None, None, None, None
+                    keyword, start, clause_start = inner.group(), pos + inner.start(), inner.end()
+                yield keyword, start, source.end(), 'from', text[clause_start:], _specifier(source)
+                pos = source.end()
+                continue
+        failed_clause_end = clause.end()
+        yield keyword, start, None, None, None, None
+
+
+def scan_imports(code, spans=None):
+    """Extract import paths in a single linear pass (see scan_statements, which also fills `spans`).
+
+    Finds static imports and re-exports (including multi-line clauses), side-effect
+    imports, dynamic `import()` (e.g. inside React.lazy) and `require()`.
+    """
+    return [statement[5] for statement in scan_statements(code, spans) if statement[3] is not None]
+
+
+_tree_sitter_parser = None
+
+
+def _get_tree_sitter_parser():
+    global _tree_sitter_parser
+    if _tree_sitter_parser is None:
+        import tree_sitter_javascript
+        from tree_sitter import Language, Parser
+        _tree_sitter_parser = Parser(Language(tree_sitter_javascript.language()))
+    return _tree_sitter_parser
+
+
+def _string_value(node):
+    if node is None or node.type not in ('string', 'template_string'):
+        return None
+    if any(child.type == 'template_substitution' for child in node.children):
+        return None
+    return ''.join(child.text.decode('utf-8') for child in node.children if child.type == 'string_fragment')
+
+
+def tree_sitter_imports(code):
+    """Extract import paths from a tree-sitter syntax tree"""
+    tree = _get_tree_sitter_parser().parse(code.encode('utf-8'))
+    imports = []
+    stack = [tree.root_node]
+    while stack:
+        node = stack.pop()
+        specifier = None
+        if node.type in ('import_statement', 'export_statement'):
+            specifier = _string_value(node.child_by_field_name('source'))
+        elif node.type == 'call_expression':
+            function = node.child_by_field_name('function')
+            arguments = node.child_by_field_name('arguments')
+            if function is not None and arguments is not None and arguments.named_child_count and (
+                    function.type == 'import' or (function.type == 'identifier' and function.text == b'require')):
+                specifier = _string_value(arguments.named_children[0])
+        if specifier is not None:
+            imports.append(specifier)
+        stack.extend(reversed(node.children))
+    return imports
+
+
+EXTRACTORS = {
+    'scanner': scan_imports,
+    'tree-sitter': tree_sitter_imports,
+    'regex': regex_imports,
+}
+# Bump an engine's version whenever its output changes, so cached results are invalidated
+EXTRACTOR_VERSIONS = {
+    'scanner': 4,
+    'tree-sitter': 1,
+    'regex': 1,
+}
+
+
+def extract_imports(code, engine='scanner'):
+    """Run an extractor engine, falling back to the scanner if it is unavailable or fails"""
+    extractor = EXTRACTORS.get(engine, scan_imports)
+    if extractor is scan_imports:
+        return scan_imports(code)
+    try:
+        return extractor(code)
+    except ImportError:
+        print(f"Import extractor '{engine}' is not installed, using 'scanner'")
+        EXTRACTORS[engine] = scan_imports
+    except Exception as e:
+        print(f"Import extractor '{engine}' failed ({e}), using 'scanner'")
+    return scan_imports(code)
@@ -0,0 +1,49 @@
+"""Shared HTTP session with connection pooling and per-host concurrency limits."""
+import contextlib
+import os
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Maximum simultaneous requests per host (guarded by host_slot)
+PER_HOST_CONCURRENCY = int(os.environ.get('PER_HOST_CONCURRENCY', '4'))
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '32'))
+
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+
+
+def get_session():
+    """Process-wide requests.Session so connections (and TLS handshakes) are reused"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+@contextlib.contextmanager
+def host_slot(url, limit=None):
+    """Hold one of the host's PER_HOST_CONCURRENCY slots for the duration of a request"""
+    host = urlparse(url).netloc
+    with _session_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = _host_semaphores[host] = threading.BoundedSemaphore(limit or PER_HOST_CONCURRENCY)
+    with semaphore:
+        yield
+
+
+def session_request(method, url, **kwargs):
+    """A request on the shared session, within the host's slots (streamed bodies need host_slot around the read)"""
+    with host_slot(url):
+        return get_session().request(method, url, **kwargs)
@@ -0,0 +1,189 @@
+"""Compact import graph: file paths interned to integer ids, adjacency stored CSR-style.
+
+Edges are appended to two flat int arrays while the graph is built and compacted on first
+read into offset/target arrays (deduplicated, in insertion order, like networkx.DiGraph).
+The reverse adjacency is only built when a reverse query needs it. Reachability from any
+number of source groups (entry points, target files, ...) is one worklist pass that
+propagates a bitmask per node.
+"""
+from array import array
+from collections import Counter, deque
+from itertools import accumulate
+from operator import itemgetter
+
+
+class ImportGraph:
+    def __init__(self):
+        self.paths = []  # id -> path (node order)
+        self.ids = {}    # path -> id
+        self._edge_sources = array('l')
+        self._edge_targets = array('l')
+        self._forward = None  # (offsets, targets) once compacted
+        self._reverse = None
+        self.entry_points = None  # Entry files, when the builder knows them (e.g. one set per workspace)
+        self.symbols = None       # Symbol mode: path -> resolved bindings (see symbols.py)
+
+    # Building
+
+    def add_node(self, path):
+        """Return the id of path, adding it if new"""
+        node_id = self.ids.get(path)
+        if node_id is None:
+            node_id = self.ids[path] = len(self.paths)
+            self.paths.append(path)
+        return node_id
+
+    def add_edge(self, source, target):
+        """Add an edge between two paths (added as nodes if needed); duplicates are dropped on compaction"""
+        self._edge_sources.append(self.add_node(source))
+        self._edge_targets.append(self.add_node(target))
+        self._forward = self._reverse = None
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        graph = cls()
+        for node in nodes:
+            graph.add_node(node)
+        for source, target in edges:
+            graph.add_edge(source, target)
+        return graph
+
+    def _compact(self):
+        """Group edges by source into CSR arrays, keeping the first occurrence of each"""
+        # dict.fromkeys drops duplicates in insertion order; the sort is stable
+        unique = sorted(dict.fromkeys(zip(self._edge_sources, self._edge_targets)), key=itemgetter(0))
+        counts = [0] * (len(self.paths) + 1)
+        for source, count in Counter(map(itemgetter(0), unique)).items():
+            counts[source + 1] = count
+        self._edge_sources = array('l', map(itemgetter(0), unique))
+        self._edge_targets = array('l', map(itemgetter(1), unique))
+        self._forward = (array('l', accumulate(counts)), self._edge_targets)
+
+    def _csr(self):
+        if self._forward is None or len(self._forward[0]) != len(self.paths) + 1:
+            self._compact()
+        return self._forward
+
+    def _reverse_csr(self):
+        if self._reverse is None or len(self._reverse[0]) != len(self.paths) + 1:
+            offsets, targets = self._csr()
+            n = len(self.paths)
+            counts = array('l', [0]) * (n + 1)
+            for target in targets:
+                counts[target + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            sources = array('l', [0]) * len(targets)
+            cursor = counts[:-1]
+            for source in range(n):
+                for target in targets[offsets[source]:offsets[source + 1]]:
+                    sources[cursor[target]] = source
+                    cursor[target] += 1
+            self._reverse = (counts, sources)
+        return self._reverse
+
+    # Read API (the subset of networkx.DiGraph the analysis uses)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __contains__(self, path):
+        return path in self.ids
+
+    def nodes(self):
+        return list(self.paths)
+
+    def edges(self):
+        """(source, target) path pairs, grouped by source in node order"""
+        offsets, targets = self._csr()
+        paths = self.paths
+        for source in range(len(paths)):
+            for target in targets[offsets[source]:offsets[source + 1]]:
+                yield paths[source], paths[target]
+
+    def number_of_nodes(self):
+        return len(self.paths)
+
+    def number_of_edges(self):
+        return len(self._csr()[1])
+
+    def successors(self, path):
+        offsets, targets = self._csr()
+        node_id = self.ids[path]
+        return [self.paths[target] for target in targets[offsets[node_id]:offsets[node_id + 1]]]
+
+    def predecessors(self, path):
+        offsets, sources = self._reverse_csr()
+        node_id = self.ids[path]
+        return [self.paths[source] for source in sources[offsets[node_id]:offsets[node_id + 1]]]
+
+    # Queries
+
+    def reach(self, source_groups):
+        """Reachability from several groups of source paths in one pass.
+        Returns a list with one int per node whose bit i is set if group i reaches it (sources included)."""
+        offsets, targets = self._csr()
+        masks = [0] * len(self.paths)
+        stack = []
+        for bit, group in enumerate(source_groups):
+            for path in group:
+                node_id = self.ids[path]
+                if not masks[node_id] >> bit & 1:
+                    masks[node_id] |= 1 << bit
+                    stack.append(node_id)
+        while stack:
+            node_id = stack.pop()
+            mask = masks[node_id]
+            for target in targets[offsets[node_id]:offsets[node_id + 1]]:
+                if masks[target] | mask != masks[target]:
+                    masks[target] |= mask
+                    stack.append(target)
+        return masks
+
+    def ancestors(self, path):
+        """Every path that (transitively) imports path"""
+        offsets, sources = self._reverse_csr()
+        start = self.ids[path]
+        seen = {start}
+        stack = [start]
+        while stack:
+            node_id = stack.pop()
+            for source in sources[offsets[node_id]:offsets[node_id + 1]]:
+                if source not in seen:
+                    seen.add(source)
+                    stack.append(source)
+        seen.discard(start)
+        return {self.paths[node_id] for node_id in seen}
+
+    def import_chain(self, path, sources):
+        """Shortest import chain from any of `sources` to path ("who keeps this file alive?"),
+        as a list of paths starting at the source, or None if none of them reaches it"""
+        offsets, importers = self._reverse_csr()
+        start = self.ids[path]
+        source_ids = {self.ids[source] for source in sources if source in self.ids}
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            node_id = queue.popleft()
+            if node_id in source_ids:
+                chain = []
+                while node_id is not None:
+                    chain.append(self.paths[node_id])
+                    node_id = parent[node_id]
+                return chain
+            for importer in importers[offsets[node_id]:offsets[node_id + 1]]:
+                if importer not in parent:
+                    parent[importer] = node_id
+                    queue.append(importer)
+        return None
+
+    def to_networkx(self, **edge_attrs):
+        """Export as a networkx.DiGraph with the same node and edge order"""
+        import networkx as nx
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.paths)
+        graph.add_edges_from(self.edges(), **edge_attrs)
+        return graph
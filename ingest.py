@@ -0,0 +1,93 @@
+"""Streaming repo ingestion: spool archives to disk and extract only what analysis needs."""
+import os
+import pathlib
+import sys
+import zipfile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def spool_response(response, dest_path, chunk_size=CHUNK_SIZE):
+    """Write an HTTP response body to disk in chunks. Returns the number of bytes written."""
+    written = 0
+    with open(dest_path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                f.write(chunk)
+                written += len(chunk)
+    return written
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def extract_selected(zip_path, dest_dir, classify, prune_dirs):
+    """Extract the members of a GitHub ZIP archive that analysis needs.
+
+    `classify(rel_path)` gets the member path relative to the archive's top folder and
+    returns 'extract' (write to disk), 'index' (record path and size only) or None (drop).
+    Directories named in `prune_dirs` are skipped with everything below them.
+
+    Returns (root_dir, assets, stats) where assets maps the would-be path of each
+    indexed member to its uncompressed size. stats['commit'] is the commit SHA that
+    `git archive` stores in the ZIP comment, if present.
+    """
+    dest_dir = pathlib.Path(dest_dir)
+    assets = {}
+    stats = {'members': 0, 'extracted': 0, 'indexed': 0, 'pruned': 0, 'bytes_written': 0}
+    top_dir = None
+    pruned_prefix = None
+
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        comment = zip_ref.comment.decode('ascii', 'ignore').strip()
+        stats['commit'] = comment if len(comment) == 40 and all(c in '0123456789abcdef' for c in comment) else None
+        for info in zip_ref.infolist():
+            stats['members'] += 1
+            name = info.filename
+            # Members are listed depth-first, so a pruned directory's contents follow it
+            if pruned_prefix and name.startswith(pruned_prefix):
+                stats['pruned'] += 1
+                continue
+
+            parts = name.rstrip('/').split('/')
+            if top_dir is None:
+                top_dir = parts[0]
+            if len(parts) < 2:
+                continue
+
+            dir_parts = parts[1:] if info.is_dir() else parts[1:-1]
+            pruned_at = next((i for i, part in enumerate(dir_parts) if part in prune_dirs), None)
+            if pruned_at is not None:
+                pruned_prefix = '/'.join(parts[:pruned_at + 2]) + '/'
+                stats['pruned'] += 1
+                continue
+            if info.is_dir():
+                continue
+
+            rel_path = pathlib.PurePosixPath(*parts[1:])
+            action = classify(rel_path)
+            if action == 'extract':
+                zip_ref.extract(info, dest_dir)
+                stats['extracted'] += 1
+                stats['bytes_written'] += info.file_size
+            elif action == 'index':
+                assets[dest_dir.joinpath(*parts)] = info.file_size
+                stats['indexed'] += 1
+
+    if top_dir is None:
+        raise RuntimeError("Empty repo ZIP")
+    root_dir = dest_dir / top_dir
+    os.makedirs(root_dir, exist_ok=True)
+    return root_dir, assets, stats
@@ -0,0 +1,136 @@
+"""Background analysis jobs: bounded worker pool with per-key single-flight.
+
+Concurrent submissions for the same key share one Job while it is queued or running,
+so N visitors to a cold repo trigger one download and render. A failed job is kept for
+its key for `keep_failed` seconds, so resubmitting (e.g. a refreshing browser) returns
+the failure instead of starting the analysis again.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = 'queued'
+        self.error = None
+        self.result = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.info = {}  # caller-supplied details included in to_dict(), e.g. the result URL
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or timeout seconds pass. Returns True if finished."""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def to_dict(self):
+        return {
+            **self.info,
+            'id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'queued_seconds': round((self.started or time.time()) - self.created, 3),
+            'run_seconds': round((self.finished or time.time()) - self.started, 3) if self.started else None,
+        }
+
+
+class JobManager:
+    def __init__(self, max_workers=2, max_queue=100, keep_finished=600, keep_failed=60):
+        self.max_queue = max_queue
+        self.keep_finished = keep_finished
+        self.keep_failed = keep_failed
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis')
+        self._lock = threading.Lock()
+        self._active = {}  # key -> queued/running Job
+        self._failed = {}  # key -> failed Job, kept for `keep_failed` seconds
+        self._jobs = {}    # id -> Job, finished ones kept for `keep_finished` seconds
+        self.metrics = {
+            'submitted': 0, 'deduplicated': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0, 'failure_reused': 0,
+            'queue_seconds_total': 0.0, 'run_seconds_total': 0.0, 'run_seconds_max': 0.0,
+        }
+
+    def submit(self, key, function, *args, **kwargs):
+        """Start function(*args, **kwargs) for key, or return the job already in flight for it
+        (or the one that failed for it within `keep_failed` seconds).
+        Raises QueueFull when max_queue jobs are already waiting."""
+        with self._lock:
+            self._purge()
+            job = self._active.get(key)
+            if job is not None:
+                self.metrics['deduplicated'] += 1
+                return job
+            job = self._failed.get(key)
+            if job is not None:
+                self.metrics['failure_reused'] += 1
+                return job
+            if self.queue_depth() >= self.max_queue:
+                self.metrics['rejected'] += 1
+                raise QueueFull(f"{self.max_queue} analysis jobs already queued")
+            job = Job(key)
+            self._active[key] = job
+            self._jobs[job.id] = job
+            self.metrics['submitted'] += 1
+        self._executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_depth(self):
+        return sum(1 for job in self._active.values() if job.status == 'queued')
+
+    def running(self):
+        return sum(1 for job in self._active.values() if job.status == 'running')
+
+    def snapshot(self):
+        """Queue depth, in-flight count and latency metrics"""
+        with self._lock:
+            metrics = dict(self.metrics, queued=self.queue_depth(), running=self.running())
+        finished = metrics['succeeded'] + metrics['failed']
+        metrics['queue_seconds_avg'] = metrics['queue_seconds_total'] / finished if finished else 0.0
+        metrics['run_seconds_avg'] = metrics['run_seconds_total'] / finished if finished else 0.0
+        return metrics
+
+    def _run(self, job, function, args, kwargs):
+        job.started = time.time()
+        job.status = 'running'
+        try:
+            job.result = function(*args, **kwargs)
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished = time.time()
+        with self._lock:
+            self._active.pop(job.key, None)
+            if job.status == 'failed':
+                self._failed[job.key] = job
+            self.metrics['succeeded' if job.status == 'done' else 'failed'] += 1
+            self.metrics['queue_seconds_total'] += job.started - job.created
+            run_seconds = job.finished - job.started
+            self.metrics['run_seconds_total'] += run_seconds
+            self.metrics['run_seconds_max'] = max(self.metrics['run_seconds_max'], run_seconds)
+        job._done.set()
+
+    def _purge(self):
+        now = time.time()
+        cutoff = now - self.keep_finished
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+        cutoff = now - self.keep_failed
+        for key in [key for key, job in self._failed.items() if job.finished < cutoff]:
+            del self._failed[key]
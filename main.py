@@ -1,16 +1,37 @@
 import os
-import re
 import sys
 import tempfile
 import pathlib
 import subprocess
 import json
 from urllib.parse import urlparse
+from email.utils import formatdate, parsedate_to_datetime
 import time
+import argparse
+import contextlib
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-import networkx as nx
 import requests
 
+import asset_refs
+import ingest
+from analysis_cache import AnalysisCache, blob_hash
+from asset_refs import REFERENCE_SOURCES, AssetIndex, asset_references, is_reference
+from extractors import EXTRACTORS, EXTRACTOR_VERSIONS, extract_imports, scan_imports as scanner_imports
+from render import BACKENDS, graph_to_dot, render_svg
+from result_cache import RESULT_CACHE, RESULT_CACHE_TTL, json_result_key, svg_result_key
+from path_index import PathIndex
+import symbols
+from symbols import SymbolTable, scan_bindings
+import http_pool
+from http_pool import get_session, host_slot, session_request
+from import_graph import ImportGraph
+from views import VIEWS, build_view, view_variant
+from workspaces import find_workspaces, is_project
+import metrics
+from metrics import stage
+
 
 # Configuration
 ALIASES = {"@/": "src/"}
@@ -20,75 +41,113 @@ SKIP_FILES = [
     "components/ui/toast.tsx", "components/ui/toaster.tsx"
 ]
 SKIP_PATTERNS = ["node_modules", ".git", "dist", "build", ".next", "__pycache__", ".vscode", ".idea"]
+CODE_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
+PROJECT_FILES = {'package.json', 'tsconfig.json', 'jsconfig.json', 'pnpm-workspace.yaml'}
+ENTRY_FILES = ["main.tsx", "index.tsx", "App.tsx"]
+# Static files served from the site root, next to src/ ('/logo.png' is public/logo.png)
+PUBLIC_DIR = 'public'
 EXTERNAL_PACKAGES = ['react', 'typescript', 'next', 'axios', 'lodash', '@radix-ui']
 VERCEL_BLOB_TOKEN = os.environ.get('BLOB_READ_WRITE_TOKEN')
+# Import extraction pool: 1 = serial, 0 = one worker per CPU; pool is 'process' or 'thread'
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', '1'))
+ANALYSIS_POOL = os.environ.get('ANALYSIS_POOL', 'process')
+# Import extractor engine: 'scanner', 'tree-sitter' or 'regex' (see extractors.py)
+IMPORT_EXTRACTOR = os.environ.get('IMPORT_EXTRACTOR', 'scanner')
+# Persistent analysis cache (set ANALYSIS_CACHE_PATH=off to disable)
+ANALYSIS_CACHE_PATH = os.environ.get(
+    'ANALYSIS_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'zombie_file_hunter', 'analysis.sqlite'))
+ANALYSIS_CACHE_MAX_MB = int(os.environ.get('ANALYSIS_CACHE_MAX_MB', '256'))
+# SVG render backend: 'auto' (local Graphviz, falling back to Kroki), 'dot', 'graphviz' or 'kroki'
+RENDER_BACKEND = os.environ.get('RENDER_BACKEND', 'auto')
+# Bump when graph construction (resolution rules, skip lists, ...) changes, to invalidate cached graphs
+GRAPH_VERSION = 4
 
 
 def download_repo(repo_url, temp_dir, github_token=None):
-    """Download GitHub repo using ZIP archive via GitHub API (no git required). Tries API, then public URLs for main/master."""
-    import zipfile
-    import io
-    import os
+    """Download GitHub repo using ZIP archive via GitHub API (no git required). Tries API, then public URLs for main/master.
 
+    The archive is spooled to disk in chunks and only the members analysis needs are extracted.
+    Returns (repo_dir, assets, commit) where assets maps non-code asset paths (not written to disk) to their
+    size and commit is the archived commit SHA (None if the archive does not record it).
+    """
     # Parse URL to get owner/repo
     parsed = urlparse(repo_url)
     path_parts = parsed.path.strip('/').split('/')
     owner, repo = path_parts[0], path_parts[1]
 
-    attempts = []
-    # 1. Try GitHub API (works for private repos with token)
-    zip_url = f"https://api.github.com/repos/{owner}/{repo}/zipball"
     headers = {}
     if github_token:
         headers['Authorization'] = f'token {github_token}'
-    print(f"Trying GitHub API ZIP URL: {zip_url}")
-    response = requests.get(zip_url, headers=headers, stream=True)
-    attempts.append((zip_url, response.status_code))
-    if response.status_code == 200:
-        try:
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                zip_ref.extractall(temp_dir)
-                extracted_dirs = [d for d in temp_dir.iterdir() if d.is_dir()]
-                if not extracted_dirs:
-                    raise RuntimeError("No directory found after extracting repo ZIP (API)")
-                return extracted_dirs[0]
-        except Exception as e:
-            print(f"Error extracting ZIP from API: {e}")
-    # 2. Try public ZIP for 'main' branch
-    zip_url_main = f"https://github.com/{owner}/{repo}/archive/refs/heads/main.zip"
-    print(f"Trying public ZIP URL (main): {zip_url_main}")
-    response = requests.get(zip_url_main, stream=True)
-    attempts.append((zip_url_main, response.status_code))
-    if response.status_code == 200:
-        try:
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                zip_ref.extractall(temp_dir)
-                extracted_dirs = [d for d in temp_dir.iterdir() if d.is_dir()]
-                if not extracted_dirs:
-                    raise RuntimeError("No directory found after extracting repo ZIP (main branch)")
-                return extracted_dirs[0]
-        except Exception as e:
-            print(f"Error extracting ZIP from public main: {e}")
-    # 3. Try public ZIP for 'master' branch
-    zip_url_master = f"https://github.com/{owner}/{repo}/archive/refs/heads/master.zip"
-    print(f"Trying public ZIP URL (master): {zip_url_master}")
-    response = requests.get(zip_url_master, stream=True)
-    attempts.append((zip_url_master, response.status_code))
-    if response.status_code == 200:
-        try:
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                zip_ref.extractall(temp_dir)
-                extracted_dirs = [d for d in temp_dir.iterdir() if d.is_dir()]
-                if not extracted_dirs:
-                    raise RuntimeError("No directory found after extracting repo ZIP (master branch)")
-                return extracted_dirs[0]
-        except Exception as e:
-            print(f"Error extracting ZIP from public master: {e}")
+    candidates = [
+        # 1. GitHub API (works for private repos with token)
+        ("GitHub API ZIP URL", f"https://api.github.com/repos/{owner}/{repo}/zipball", headers),
+        # 2. Public ZIP for 'main' branch
+        ("public ZIP URL (main)", f"https://github.com/{owner}/{repo}/archive/refs/heads/main.zip", {}),
+        # 3. Public ZIP for 'master' branch
+        ("public ZIP URL (master)", f"https://github.com/{owner}/{repo}/archive/refs/heads/master.zip", {}),
+    ]
+
+    attempts = []
+    zip_path = temp_dir / "repo.zip"
+    for label, zip_url, zip_headers in candidates:
+        print(f"Trying {label}: {zip_url}")
+        with host_slot(zip_url), get_session().get(zip_url, headers=zip_headers, stream=True) as response:
+            attempts.append((zip_url, response.status_code))
+            if response.status_code != 200:
+                continue
+            try:
+                with stage('download') as timer:
+                    downloaded = ingest.spool_response(response, zip_path)
+                    timer.add(bytes=downloaded)
+                with stage('extract') as timer:
+                    repo_dir, assets, stats = ingest.extract_selected(
+                        zip_path, temp_dir, classify_archive_member, SKIP_PATTERNS)
+                    timer.add(bytes=stats['bytes_written'], items=stats['extracted'])
+            except Exception as e:
+                print(f"Error extracting ZIP from {label}: {e}")
+                continue
+            finally:
+                if zip_path.exists():
+                    zip_path.unlink()
+        peak = ingest.peak_rss_mb()
+        print(f"Downloaded {downloaded} bytes; extracted {stats['extracted']}/{stats['members']} members "
+              f"({stats['bytes_written']} bytes written), indexed {stats['indexed']} assets, "
+              f"pruned {stats['pruned']}" + (f"; peak RSS {peak:.1f} MB" if peak is not None else ""))
+        return repo_dir, assets, stats['commit']
     # If all attempts fail, raise a clear error
     msg = "\n".join([f"Tried: {url} (status {status})" for url, status in attempts])
     raise RuntimeError(f"Failed to download repo ZIP after multiple attempts.\n{msg}\nCheck if the repo exists, is public, or if you need a valid GitHub token.")
 
 
+def get_head_commit(owner, repo, github_token=None):
+    """Look up the SHA of the default branch head without downloading anything (None on failure)"""
+    headers = {'Accept': 'application/vnd.github.sha'}
+    if github_token:
+        headers['Authorization'] = f'token {github_token}'
+    try:
+        with stage('head_commit'):
+            response = session_request('GET', f"https://api.github.com/repos/{owner}/{repo}/commits/HEAD", headers=headers,
+                                       timeout=10)
+    except requests.RequestException as e:
+        print(f"Could not look up head commit: {e}")
+        return None
+    sha = response.text.strip()
+    return sha if response.status_code == 200 and len(sha) == 40 else None
+
+
+def classify_archive_member(rel_path):
+    """Decide whether an archive member is extracted, only indexed (path and size), or dropped"""
+    if rel_path.name in PROJECT_FILES or (rel_path.name.startswith('tsconfig') and rel_path.suffix == '.json'):
+        return 'extract'
+    if rel_path.suffix.lower() in CODE_EXTENSIONS:
+        return None if rel_path.name.endswith('.d.ts') else 'extract'
+    if rel_path.suffix.lower() in REFERENCE_SOURCES:
+        return 'extract'  # Scanned for asset references, so needed on disk
+    if should_include_non_code_file(rel_path):
+        return 'index'
+    return None
+
+
 def find_src_directory(repo_dir):
     """Find the main source directory (src/ or project root with package.json)"""
     # Look for package.json files
@@ -101,10 +160,8 @@ def find_src_directory(repo_dir):
         try:
             with open(package_json) as f:
                 pkg = json.load(f)
-                deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-                
                 # Check if it's a React/TypeScript project
-                if any(dep in deps for dep in ["react", "typescript", "@types/react", "next", "vite"]):
+                if is_project(pkg):
                     project_root = package_json.parent
                     src_dir = project_root / "src"
                     return src_dir if src_dir.exists() else project_root
@@ -161,23 +218,113 @@ def should_include_non_code_file(file_path):
     return extension in included_extensions
 
 
-def get_imports(code):
-    """Extract import paths from code"""
-    patterns = [
-        r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',  # import ... from "path"
-        r'import\s+[\'"]([^\'"]+)[\'"]',                # import "path"
-        r'export\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',  # export ... from "path"
-    ]
-    
-    imports = []
-    for pattern in patterns:
-        imports.extend(re.findall(pattern, code, re.MULTILINE))
-    
-    return imports
+def get_imports(code, extractor=None):
+    """Extract import paths from code (extractor engine defaults to IMPORT_EXTRACTOR), followed by
+    the asset references (see asset_refs.py) that are not imports already"""
+    extractor = extractor or IMPORT_EXTRACTOR
+    spans = None
+    if EXTRACTORS.get(extractor) is scanner_imports:
+        spans = []  # one lexer pass finds the imports and the literals asset references are taken from
+        imports = scanner_imports(code, spans)
+    else:
+        imports = extract_imports(code, extractor)
+    seen = set(imports)
+    return imports + [reference for reference in asset_references(code, spans) if reference not in seen]
+
+
+def read_imports(file, extractor=None, parse=get_imports):
+    """Read a code file and extract its imports. Returns (imports, error) so pool workers never raise."""
+    try:
+        return parse(file.read_text(encoding='utf-8'), extractor), None
+    except Exception as e:
+        return None, e
+
+
+def extract_code_imports(code, extractor=None, parse=get_imports):
+    """Extract imports from already-read code. Returns (imports, error) so pool workers never raise."""
+    try:
+        return parse(code, extractor), None
+    except Exception as e:
+        return None, e
+
+
+def get_symbol_imports(code, extractor=None):
+    """Symbol mode: (imports, bindings) of a file from one read; bindings are its named imports, re-exports
+    and exports (see symbols.scan_bindings)"""
+    return get_imports(code, extractor), scan_bindings(code)
+
+
+def run_pool(function, items, workers=1, pool='process'):
+    """Map function over items, in order, on a worker pool when workers != 1 (0 = one per CPU)"""
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(items) < 2:
+        return map(function, items)
+    executor_class = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        # executor.map keeps input order, so merging stays deterministic
+        chunksize = max(1, len(items) // (workers * 4))
+        return list(executor.map(function, items, chunksize=chunksize))
+
+
+def scan_imports(code_files, workers=1, pool='process', extractor=None, cache=None, parse=get_imports):
+    """Return (imports, error) for each code file, in order. Fans out over a worker pool when workers != 1.
+    With an AnalysisCache, files are read and hashed up front and only unseen contents are parsed.
+    `parse` is get_imports, or get_symbol_imports for the symbol-mode scan."""
+    extractor = extractor or IMPORT_EXTRACTOR
+    if cache is None:
+        return run_pool(functools.partial(read_imports, extractor=extractor, parse=parse), code_files, workers, pool)
+
+    results = [None] * len(code_files)
+    keys, texts = {}, {}
+    version = f"{extractor}:{EXTRACTOR_VERSIONS.get(extractor, 0)}:{asset_refs.VERSION}"
+    if parse is get_symbol_imports:
+        version += f":symbols{symbols.VERSION}"
+    for i, file in enumerate(code_files):
+        try:
+            data = file.read_bytes()
+            texts[i] = data.decode('utf-8')
+            keys[i] = f"{version}:{blob_hash(data)}"
+        except Exception as e:
+            results[i] = (None, e)
+    cached = cache.get_imports_many(list(keys.values()))
+    misses = [i for i in keys if keys[i] not in cached]
+    parsed = run_pool(functools.partial(extract_code_imports, extractor=extractor, parse=parse),
+                      [texts[i] for i in misses], workers, pool)
+    fresh = {}
+    for i, (imports, error) in zip(misses, parsed):
+        results[i] = (imports, error)
+        if error is None:
+            fresh[keys[i]] = imports
+    for i in keys:
+        if results[i] is None:
+            results[i] = (cached.get(keys[i], fresh.get(keys[i])), None)
+    if fresh:
+        cache.put_imports_many(fresh)
+    return results
+
 
+def resolve_import(import_path, source_file, root_dir, index=None, workspace=None):
+    """Convert import path to actual file path. With a PathIndex, probing is done in memory and memoized.
+    With a Workspace (see workspaces.py), its tsconfig paths and sibling packages are used instead of ALIASES."""
+    if index is None:
+        return _resolve_import(import_path, source_file, root_dir, workspace=workspace)
+    key = (source_file.parent, import_path)
+    try:
+        return index.memo[key]
+    except KeyError:
+        resolved = index.memo[key] = _resolve_import(import_path, source_file, root_dir, index, workspace)
+        return resolved
 
-def resolve_import(import_path, source_file, root_dir):
-    """Convert import path to actual file path"""
+
+def import_target(import_path, source_file, root_dir, workspace=None):
+    """Path an import points at before extension/index probing, or None for skipped and non-local imports"""
+    # Imports of another workspace's package, by name
+    if workspace is not None and workspace.packages:
+        target = workspace.package_target(import_path)
+        if target is not None:
+            return target
+    
     # Skip external packages
     for pkg in EXTERNAL_PACKAGES:
         if pkg in import_path:
@@ -192,6 +339,9 @@ def resolve_import(import_path, source_file, root_dir):
         if pattern in import_path:
             return None
     
+    if workspace is not None:
+        return workspace.local_target(import_path, source_file)
+    
     # Skip non-local imports
     if not import_path.startswith('.') and not import_path.startswith('@/') and not import_path.startswith('src/'):
         return None
@@ -204,11 +354,23 @@ def resolve_import(import_path, source_file, root_dir):
     
     # Resolve path
     if import_path.startswith('./') or import_path.startswith('../'):
-        target = (source_file.parent / import_path).resolve()
+        target = source_file.parent / import_path
     elif import_path.startswith('src/'):
-        target = (root_dir / import_path[4:]).resolve()  # Remove 'src/'
+        target = root_dir / import_path[4:]  # Remove 'src/'
     else:
-        target = (root_dir / import_path).resolve()
+        target = root_dir / import_path
+    return target
+
+
+def _resolve_import(import_path, source_file, root_dir, index=None, workspace=None):
+    target = import_target(import_path, source_file, root_dir, workspace)
+    if target is None:
+        return None
+    
+    if index is not None:
+        # Same probing order as below, answered from the in-memory index
+        return index.lookup(pathlib.Path(os.path.normpath(target)))
+    target = target.resolve()
     
     # Try different extensions
     for ext in ['', '.tsx', '.ts', '.jsx', '.js']:
@@ -226,31 +388,148 @@ def resolve_import(import_path, source_file, root_dir):
     return None
 
 
-def analyze_repository(root_dir, repo_name, blob_filename, my_companies_file=None):
-    """Main analysis function"""
-    print(f"Analyzing {repo_name} in {root_dir}")
-    
-    # Find all source files (code files)
-    code_files = []
-    for pattern in ["*.ts", "*.tsx", "*.js", "*.jsx"]:
-        code_files.extend(root_dir.rglob(pattern))
-    
-    # Filter code files
-    code_files = [f for f in code_files 
-                  if not f.name.endswith('.d.ts') and 
-                  not should_skip_file(f.relative_to(root_dir))]
-    
-    # Find all other files (non-code files like PDFs, images, etc.)
-    all_files = []
-    for file in root_dir.rglob("*"):
-        if file.is_file() and not should_skip_file(file.relative_to(root_dir)):
-            all_files.append(file)
-    
-    # Separate code files from other files
+def node_name(file, root_dir):
+    """Graph node of a file: its path relative to root_dir (a public/ folder next to it gives '../public/...')"""
+    try:
+        return str(file.relative_to(root_dir))
+    except ValueError:
+        return os.path.relpath(file, root_dir)
+
+
+def public_directory(root_dir, workspace=None):
+    """The project's PUBLIC_DIR: next to src/, or inside root_dir when the sources live at the project root"""
+    if workspace is not None:
+        return workspace.root / PUBLIC_DIR
+    return (root_dir.parent if root_dir.name == 'src' else root_dir) / PUBLIC_DIR
+
+
+def index_source_tree(root_dir, assets=None, workspace=None):
+    """Walk the source tree (and the public/ assets next to it) into a PathIndex. Returns (index, public_dir).
+    `assets` are non-code files known from the archive but not extracted."""
+    index = PathIndex(root_dir, SKIP_PATTERNS)
+    root_dir = index.root_dir
+    public_dir = public_directory(root_dir, workspace)
+    outside = not public_dir.is_relative_to(root_dir)
+    if outside and public_dir.is_dir():
+        index.add_tree(public_dir, SKIP_PATTERNS, lambda path: path.suffix.lower() not in CODE_EXTENSIONS)
+    for asset in assets or ():
+        if asset.is_relative_to(root_dir) or (outside and asset.is_relative_to(public_dir)):
+            index.add_file(asset)
+    return index, public_dir
+
+
+def scanned_files(code_files, other_files):
+    """Files whose text is scanned: code, plus stylesheets and HTML that reference assets"""
+    return code_files + [file for file in other_files if file.suffix.lower() in REFERENCE_SOURCES]
+
+
+def collect_files(files, root_dir):
+    """Split indexed files into (code_files, other_files) graph nodes; code files are grouped by extension"""
+    code_groups = {ext: [] for ext in ['.ts', '.tsx', '.js', '.jsx']}
+    other_files = []
     code_extensions = {'.ts', '.tsx', '.js', '.jsx', '.d.ts'}
-    other_files = [f for f in all_files 
-                   if f.suffix.lower() not in code_extensions and 
-                   should_include_non_code_file(f)]
+    for file in files:
+        if should_skip_file(node_name(file, root_dir)):
+            continue
+        if file.suffix in code_groups:
+            if not file.name.endswith('.d.ts'):
+                code_groups[file.suffix].append(file)
+        # Find all other files (non-code files like PDFs, images, etc.)
+        if file.suffix.lower() not in code_extensions and should_include_non_code_file(file):
+            other_files.append(file)
+    code_files = [f for group in code_groups.values() for f in group]
+    return code_files, other_files
+
+
+def resolve_target(import_path, file, root_dir, index, workspace=None, assets=None):
+    """Graph node (path relative to root_dir) an import of `file` points at, or None.
+    References to assets that are not imports are placed by `assets` (an AssetIndex)."""
+    resolved = resolve_import(import_path, file, root_dir, index, workspace)
+    if resolved is None and assets is not None and is_reference(import_path):
+        resolved = assets.resolve(import_path, file, root_dir)
+    if not resolved or resolved == file:
+        return None
+    try:
+        return str(resolved.relative_to(root_dir))
+    except ValueError:
+        if index is None or not index.is_file(resolved):
+            return None  # Outside root directory
+        return node_name(resolved, root_dir)  # Indexed, e.g. in public/
+
+
+def resolve_edges(file, imports, root_dir, index, workspace=None, assets=None, resolved=None):
+    """Resolve a code file's imports to the graph nodes they point at (see resolve_target).
+    `resolved`, if given, collects {specifier: node or None} for resolve_bindings."""
+    targets = []
+    for import_path in imports:
+        target = resolve_target(import_path, file, root_dir, index, workspace, assets)
+        if resolved is not None:
+            resolved[import_path] = target
+        if target is not None:
+            targets.append(target)
+    return targets
+
+
+def resolve_bindings(bindings, resolved):
+    """A file's bindings (symbols.scan_bindings) with specifiers replaced by the nodes resolve_edges
+    resolved them to (`resolved`); imports of packages and other specifiers without an edge are dropped"""
+    record = {'exports': bindings['exports']}
+    for kind in ('imports', 'reexports'):
+        record[kind] = [[resolved[import_path], names] for import_path, names in bindings[kind]
+                        if resolved.get(import_path) is not None]
+    return record
+
+
+def scan_sources(sources, root_dir, index, workers=None, pool=None, extractor=None, cache=None, with_symbols=False):
+    """Extract and resolve the imports of (file, workspace, asset_index) sources, timed as the 'scan' and
+    'resolve' stages. Yields (file, imports, targets, symbols) for each file that could be processed:
+    targets are the nodes its imports resolve to, symbols its resolved bindings (see resolve_bindings)
+    when `with_symbols` is set and it is a code file, else None. Errors are printed and the file skipped."""
+    workers = ANALYSIS_WORKERS if workers is None else workers
+    files = [file for file, _, _ in sources]
+    with stage('scan') as timer:
+        scanned = list(scan_imports(files, workers, pool or ANALYSIS_POOL, extractor, cache,
+                                    get_symbol_imports if with_symbols else get_imports))
+        timer.add(items=len(files))
+    with stage('resolve') as timer:
+        for (file, workspace, asset_index), (imports, error) in zip(sources, scanned):
+            if error is not None:
+                print(f"Error processing {file}: {error}")
+                continue
+            try:
+                bindings = None
+                if with_symbols:
+                    imports, bindings = imports
+                resolved = {} if bindings is not None and file.suffix in CODE_EXTENSIONS else None
+                timer.add(items=len(imports))
+                targets = resolve_edges(file, imports, root_dir, index, workspace, asset_index, resolved)
+                record = resolve_bindings(bindings, resolved) if resolved is not None else None
+            except Exception as e:
+                print(f"Error processing {file}: {e}")
+                continue
+            yield file, imports, targets, record
+
+
+def build_import_graph(root_dir, assets=None, workers=None, pool=None, extractor=None, cache=None, workspace=None,
+                       with_symbols=None):
+    """Walk the source tree and build the file import graph.
+
+    `assets` lists non-code files known from the archive but not extracted.
+    `workers`/`pool` configure parallel import extraction (defaults: ANALYSIS_WORKERS/ANALYSIS_POOL),
+    `extractor` picks the import extractor engine (default: IMPORT_EXTRACTOR) and
+    `cache` (an AnalysisCache) skips parsing files whose contents were seen before.
+    `workspace` supplies the project's tsconfig/jsconfig aliases (default: ALIASES).
+    `with_symbols` also records each code file's bindings in graph.symbols (default: symbols.SYMBOL_ANALYSIS).
+    """
+    # Walk the tree once; the index serves both the node set and import resolution
+    with stage('walk') as timer:
+        index, public_dir = index_source_tree(root_dir, assets, workspace)
+        root_dir = index.root_dir
+        timer.add(items=len(index.files))
+    if workspace is not None:
+        workspace.index = index
+    
+    code_files, other_files = collect_files(index.files, root_dir)
     
     # Combine all files
     files = code_files + other_files
@@ -258,108 +537,315 @@ def analyze_repository(root_dir, repo_name, blob_filename, my_companies_file=Non
     print(f"Found {len(code_files)} code files and {len(other_files)} other files ({len(files)} total)")
     
     # Build import graph
-    graph = nx.DiGraph()
+    graph = ImportGraph()
     
     for file in files:
-        file_rel = str(file.relative_to(root_dir))
-        graph.add_node(file_rel)
+        graph.add_node(node_name(file, root_dir))
     
-    # Add edges for imports (only for code files)
-    for file in code_files:
-        try:
-            code = file.read_text(encoding='utf-8')
-            imports = get_imports(code)
-            file_rel = str(file.relative_to(root_dir))
-            
-            for import_path in imports:
-                resolved = resolve_import(import_path, file, root_dir)
-                if resolved and resolved != file:
-                    try:
-                        target_rel = str(resolved.relative_to(root_dir))
-                        graph.add_edge(file_rel, target_rel, dir='back')
-                    except ValueError:
-                        continue  # Outside root directory
-        except Exception as e:
-            print(f"Error processing {file}: {e}")
+    # Add edges for imports and asset references (code files, stylesheets and HTML)
+    asset_index = AssetIndex(other_files, public_dir)
+    sources = [(file, workspace, asset_index) for file in scanned_files(code_files, other_files)]
+    with_symbols = symbols.SYMBOL_ANALYSIS if with_symbols is None else with_symbols
+    if with_symbols:
+        graph.symbols = {}
+    for file, _, targets, record in scan_sources(sources, root_dir, index, workers, pool, extractor, cache,
+                                                 with_symbols):
+        file_rel = node_name(file, root_dir)
+        for target_rel in targets:
+            graph.add_edge(file_rel, target_rel)
+        if record is not None:
+            graph.symbols[file_rel] = record
     
     print(f"Graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+    return graph
+
+
+def build_workspace_graph(repo_dir, workspaces, assets=None, workers=None, pool=None, extractor=None, cache=None,
+                          with_symbols=None):
+    """Build one combined import graph for the workspaces of a monorepo (see workspaces.py).
+
+    The repo is walked once into an index all workspaces share, so imports between workspaces
+    (relative, aliased or by package name) resolve. The imports of every workspace's files are
+    extracted in a single scan_imports call, so one worker pool covers all workspaces at once.
+    Nodes are paths relative to repo_dir; graph.entry_points holds each app's entry files, or a
+    library's package entry when it has none.
+    """
+    with stage('walk') as timer:
+        index, _ = index_source_tree(repo_dir, assets)
+        repo_dir = index.root_dir
+        timer.add(items=len(index.files))
+    
+    # Each file belongs to the innermost workspace containing it, if it is in that workspace's source
+    # directory (or is an asset in its public/ folder)
+    roots = sorted(workspaces, key=lambda workspace: len(workspace.root.parts), reverse=True)
+    owned = {workspace.root: [] for workspace in workspaces}
+    for file in index.files:
+        for workspace in roots:
+            if file.is_relative_to(workspace.root):
+                is_public_asset = file.suffix.lower() not in CODE_EXTENSIONS \
+                    and file.is_relative_to(public_directory(repo_dir, workspace))
+                if file.is_relative_to(workspace.src_dir) or is_public_asset:
+                    owned[workspace.root].append(file)
+                break
+    
+    graph = ImportGraph()
+    graph.entry_points = []
+    sources = []  # (scanned file, workspace, asset index)
+    code_count = other_count = 0
+    for workspace in workspaces:
+        workspace.index = index
+        code_files, other_files = collect_files(owned[workspace.root], workspace.src_dir)
+        print(f"Workspace {workspace.root.relative_to(repo_dir).as_posix() or '.'}"
+              + (f" ({workspace.name})" if workspace.name else '')
+              + f": {len(code_files)} code files, {len(other_files)} other files")
+        for file in code_files + other_files:
+            graph.add_node(str(file.relative_to(repo_dir)))
+        asset_index = AssetIndex(other_files, public_directory(repo_dir, workspace))
+        sources += [(file, workspace, asset_index) for file in scanned_files(code_files, other_files)]
+        code_count += len(code_files)
+        other_count += len(other_files)
+        entries = [workspace.src_dir / name for name in ENTRY_FILES if index.is_file(workspace.src_dir / name)]
+        if not entries and workspace.name:
+            entry = index.lookup(workspace.entry())
+            entries = [entry] if entry is not None else []
+        graph.entry_points += [str(entry.relative_to(repo_dir)) for entry in entries]
+    print(f"Found {code_count} code files and {other_count} other files in {len(workspaces)} workspaces "
+          f"({code_count + other_count} total)")
     
+    with_symbols = symbols.SYMBOL_ANALYSIS if with_symbols is None else with_symbols
+    if with_symbols:
+        graph.symbols = {}
+    for file, _, targets, record in scan_sources(sources, repo_dir, index, workers, pool, extractor, cache,
+                                                 with_symbols):
+        file_rel = str(file.relative_to(repo_dir))
+        for target_rel in targets:
+            graph.add_edge(file_rel, target_rel)
+        if record is not None:
+            graph.symbols[file_rel] = record
+    
+    print(f"Graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+    return graph
+
+
+def find_project(repo_dir):
+    """(src_dir, workspace) of a single-project repo, or (None, workspaces) for a monorepo"""
+    workspaces = find_workspaces(repo_dir, ALIASES, SKIP_PATTERNS)
+    if len(workspaces) > 1:
+        return None, workspaces
+    if workspaces:
+        return workspaces[0].src_dir, workspaces[0]
+    return find_src_directory(repo_dir), None
+
+
+def build_repo_graph(repo_dir, assets=None, workers=None, pool=None, extractor=None, cache=None, label=None,
+                     with_symbols=None):
+    """Import graph of a checked-out repo: one project (nodes relative to its source directory)
+    or every workspace of a monorepo in one combined graph (nodes relative to repo_dir)"""
+    src_dir, workspace = find_project(repo_dir)
+    if src_dir is None:
+        workspaces = workspace
+        print(f"Analyzing {label or repo_dir}: monorepo with {len(workspaces)} workspaces")
+        return build_workspace_graph(repo_dir, workspaces, assets, workers, pool, extractor, cache, with_symbols)
+    print(f"Analyzing {label + ' in ' if label else ''}{src_dir}")
+    return build_import_graph(src_dir, assets, workers, pool, extractor, cache, workspace, with_symbols)
+
+
+def graph_to_payload(graph):
+    """Serialize an import graph (node order, entry points and symbol-mode bindings included) for the analysis cache"""
+    return {'nodes': list(graph.nodes()), 'edges': [list(edge) for edge in graph.edges()],
+            'entry_points': graph.entry_points, 'symbols': graph.symbols}
+
+
+def graph_from_payload(payload):
+    graph = ImportGraph.from_edges(payload['nodes'], payload['edges'])
+    graph.entry_points = payload.get('entry_points')
+    graph.symbols = payload.get('symbols')
+    return graph
+
+
+_analysis_cache = (None, None)  # (pid, AnalysisCache): one connection per process, so hit counts accumulate
+
+
+def get_analysis_cache():
+    """Open the persistent analysis cache, or return None if it is disabled or unusable"""
+    global _analysis_cache
+    if not ANALYSIS_CACHE_PATH or ANALYSIS_CACHE_PATH == 'off':
+        return None
+    pid, cache = _analysis_cache
+    if pid == os.getpid():
+        return cache
+    try:
+        cache = AnalysisCache(ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MAX_MB * 1024 * 1024)
+    except Exception as e:
+        print(f"Analysis cache unavailable ({e}), continuing without it")
+        return None
+    _analysis_cache = (os.getpid(), cache)
+    return cache
+
+
+def find_unused(graph, my_companies_file=None):
+    """Reachability from the entry points (and from my_companies_file, if given), in one pass over the graph.
+    Returns a dict with entry_points, connected (set), unused (list, graph order) and target_connected (set).
+
+    For a graph built in symbol mode, connected and unused come from symbol-level reachability instead, and
+    the dict also holds dead_import_only (files only imported without using them, directly or through a
+    barrel) and unused_exports ({file: names}) of the files that are used."""
     # Find entry points and unused components
-    entry_points = [node for node in graph.nodes() if node in ["main.tsx", "index.tsx", "App.tsx"]]
-    if not entry_points and graph.nodes():
-        entry_points = [list(graph.nodes())[0]]  # Use first file as fallback
-    
-    # Find reachable nodes
-    connected = set()
-    if entry_points and graph.number_of_edges() > 0:
-        for entry in entry_points:
-            if entry in graph:
-                connected.update(nx.descendants(graph, entry))
-                connected.add(entry)
-    
-    unused = [node for node in graph.nodes() if node not in connected]
-    
-    # Find files connected to myCompanies.tsx if specified
-    my_companies_connected = set()
+    candidates = graph.entry_points if graph.entry_points is not None else ENTRY_FILES
+    entry_points = [node for node in candidates if node in graph]
+    entry_points.sort(key=graph.ids.get)
+    if not entry_points and len(graph):
+        entry_points = [graph.paths[0]]  # Use first file as fallback
+    
+    # Bit 0: reachable from an entry point; bit 1: reachable from my_companies_file
+    source_groups = [entry_points if graph.number_of_edges() > 0 else []]
     if my_companies_file and my_companies_file in graph:
-        my_companies_connected.update(nx.descendants(graph, my_companies_file))
-        my_companies_connected.add(my_companies_file)
+        source_groups.append([my_companies_file])
+    with stage('reachability') as timer:
+        masks = graph.reach(source_groups)
+        timer.add(items=len(masks))
+    
+    connected = {node for node, mask in zip(graph.paths, masks) if mask & 1}
+    unused = [node for node, mask in zip(graph.paths, masks) if not mask & 1]
+    my_companies_connected = {node for node, mask in zip(graph.paths, masks) if mask & 2}
     
+    result = {
+        'entry_points': entry_points,
+        'connected': connected,
+        'unused': unused,
+        'target_connected': my_companies_connected,
+    }
+    if graph.symbols is not None:
+        with stage('symbol_reachability') as timer:
+            table = SymbolTable(graph, graph.symbols)
+            touched, evaluated, requested = table.reach(source_groups[0])
+            timer.add(items=len(requested))
+        result['connected'] = {node for node, live in zip(graph.paths, touched) if live}
+        result['unused'] = [node for node, live in zip(graph.paths, touched) if not live]
+        result['dead_import_only'] = [node for node, live in zip(graph.paths, touched) if not live and node in connected]
+        result['unused_exports'] = table.unused_exports(evaluated, requested, set(entry_points))
+    return result
+
+
+def node_category(node, reachability, my_companies_file=None):
+    """Classify a node for coloring: asset, unused_asset (referenced by no reachable file), target, connected,
+    ui (unused UI component) or unused"""
+    is_code_file = pathlib.PurePath(node).suffix.lower() in CODE_EXTENSIONS
+    if not is_code_file:
+        return 'asset' if node in reachability['connected'] else 'unused_asset'
+    if my_companies_file and node in reachability['target_connected']:
+        return 'target'
+    if node in reachability['connected']:
+        return 'connected'
+    if 'components/ui' in node.lower():
+        return 'ui'
+    return 'unused'
+
+
+def print_report(reachability):
     print(f"\nResults:")
-    print(f"Entry points: {entry_points}")
-    print(f"Connected components: {len(connected)}")
-    print(f"Unused components: {len(unused)}")
+    print(f"Entry points: {reachability['entry_points']}")
+    print(f"Connected components: {len(reachability['connected'])}")
+    print(f"Unused components: {len(reachability['unused'])}")
     
-    if unused:
+    if reachability['unused']:
         print("\nUnused files:")
-        for file in unused:
+        for file in reachability['unused']:
+            print(f"  - {file}")
+    if reachability.get('dead_import_only'):
+        print("\nKept alive only by unused imports:")
+        for file in reachability['dead_import_only']:
             print(f"  - {file}")
+    if reachability.get('unused_exports'):
+        print("\nUnused exports:")
+        for file, names in reachability['unused_exports'].items():
+            print(f"  - {file}: {', '.join(names)}")
+
+
+def analysis_report(graph, reachability, my_companies_file=None, repo=None, commit=None):
+    """JSON-serializable analysis result: reachability sets and edges, all in graph order"""
+    nodes = list(graph.nodes())
+    categories = {node: node_category(node, reachability, my_companies_file) for node in nodes}
+    report = {
+        'repo': repo,
+        'commit': commit,
+        'target_file': my_companies_file,
+        'entry_points': reachability['entry_points'],
+        'nodes': nodes,
+        'connected': [node for node in nodes if node in reachability['connected']],
+        'unused': reachability['unused'],
+        'unused_ui': [node for node in nodes if categories[node] == 'ui'],
+        'unused_assets': [node for node in nodes if categories[node] == 'unused_asset'],
+        'target_connected': [node for node in nodes if node in reachability['target_connected']],
+        'edges': [[source, target] for source, target in graph.edges()],
+        'counts': {
+            'nodes': len(nodes),
+            'edges': graph.number_of_edges(),
+            'connected': len(reachability['connected']),
+            'unused': len(reachability['unused']),
+            'unused_ui': sum(1 for category in categories.values() if category == 'ui'),
+            'unused_assets': sum(1 for category in categories.values() if category == 'unused_asset'),
+        },
+    }
+    if 'dead_import_only' in reachability:
+        # Symbol mode (see find_unused)
+        report['dead_import_only'] = reachability['dead_import_only']
+        report['unused_exports'] = reachability['unused_exports']
+        report['counts']['dead_import_only'] = len(reachability['dead_import_only'])
+        report['counts']['unused_exports'] = sum(map(len, reachability['unused_exports'].values()))
+    return report
+
+
+def analyze_repository(root_dir, repo_name, blob_filename, my_companies_file=None, assets=None, workers=None, pool=None,
+                       extractor=None, cache=None, graph=None, cache_key=None, render_backend=None, view='full', depth=1,
+                       collapse=None, reachability=None, output_path=None):
+    """Main analysis function. Builds the import graph (see build_import_graph) unless a prebuilt
+    `graph` is given, then finds unused files and renders the SVG (stored in RESULT_CACHE under `cache_key`).
+    `view`, `depth` and `collapse` select the level of detail (see views.py); `reachability` is find_unused()'s
+    result if already computed. With `output_path` the SVG is written there instead of being uploaded."""
+    if graph is None:
+        print(f"Analyzing {repo_name} in {root_dir}")
+        graph = build_import_graph(root_dir, assets, workers, pool, extractor, cache)
     
-    # Generate visualization
-    tmp_dir = '/tmp'
-    dot_path = os.path.join(tmp_dir, f"{blob_filename.replace('/', '_')}.dot")
-    svg_path = os.path.join(tmp_dir, f"{blob_filename.replace('/', '_')}.svg")
-
-    # Color nodes
-    for node in graph.nodes():
-        node_path = root_dir / node
-        is_code_file = node_path.suffix.lower() in {'.ts', '.tsx', '.js', '.jsx'}
-        if not is_code_file:
-            graph.nodes[node]['color'] = 'yellow'
-        elif my_companies_file and node in my_companies_connected:
-            graph.nodes[node]['color'] = 'lightgreen'
-        elif node in connected:
-            graph.nodes[node]['color'] = 'lightblue'
-        elif 'components/ui' in node.lower():
-            graph.nodes[node]['color'] = 'orange'
-        else:
-            graph.nodes[node]['color'] = 'red'
-        graph.nodes[node]['style'] = 'filled'
-
-    # Write DOT file
-    nx.drawing.nx_pydot.write_dot(graph, dot_path)
-    # Use Kroki to generate SVG
-    with open(dot_path, 'r', encoding='utf-8') as f:
-        dot_code = f.read()
-    svg = dot_to_svg(dot_code)
+    if reachability is None:
+        reachability = find_unused(graph, my_companies_file)
+    print_report(reachability)
+    
+    svg = render_graph_svg(graph, reachability, my_companies_file, render_backend, view, depth, collapse)
     # Save SVG locally for caching
-    local_blob_dir = "/tmp/blob"
-    os.makedirs(local_blob_dir, exist_ok=True)
-    local_svg_path = os.path.join(local_blob_dir, blob_filename.replace('/', '_'))
-    with open(local_svg_path, "w", encoding="utf-8") as f:
-        f.write(svg)
+    if cache_key:
+        RESULT_CACHE.put(cache_key, svg)
+    if output_path:
+        pathlib.Path(output_path).write_text(svg, encoding='utf-8')
+        return str(output_path)
     print(f"Uploading SVG to Vercel Blob: {blob_filename}")
     svg_url = upload_svg_to_vercel_blob(blob_filename, svg)
     print(f"Uploaded SVG to {svg_url}")
     return svg_url
 
 
-def dot_to_svg(dot_code):
-    url = 'https://kroki.io/graphviz/svg'
-    headers = {'Content-Type': 'text/plain'}
-    response = requests.post(url, headers=headers, data=dot_code.encode('utf-8'))
-    response.raise_for_status()
-    return response.text  # This is the SVG as a string
+def render_graph_svg(graph, reachability, my_companies_file=None, render_backend=None, view='full', depth=1,
+                     collapse=None):
+    """Color the analyzed graph, reduce it to the requested view and render it to an SVG string"""
+    # Color nodes and reduce the graph to the requested view (a networkx graph)
+    categories = {node: node_category(node, reachability, my_companies_file) for node in graph}
+    view_graph = build_view(graph, categories, view, depth, collapse)
+    if view_graph.number_of_nodes() != graph.number_of_nodes():
+        print(f"{view} view: {view_graph.number_of_nodes()} nodes, {view_graph.number_of_edges()} edges")
+
+    # Generate visualization: DOT straight from the graph, SVG from the render backend
+    with stage('dot') as timer:
+        dot_code = graph_to_dot(view_graph)
+        timer.add(bytes=len(dot_code), items=view_graph.number_of_nodes())
+    with stage('render') as timer:
+        svg = dot_to_svg(dot_code, render_backend)
+        timer.add(bytes=len(svg))
+    return svg
+
+
+def dot_to_svg(dot_code, backend=None):
+    """Render DOT to an SVG string with the given backend (default: RENDER_BACKEND)"""
+    return render_svg(dot_code, backend or RENDER_BACKEND)
 
 
 def upload_svg_to_vercel_blob(filename, svg_content, access_token=VERCEL_BLOB_TOKEN, access='public'):
@@ -370,56 +856,242 @@ def upload_svg_to_vercel_blob(filename, svg_content, access_token=VERCEL_BLOB_TO
         "Content-Type": "image/svg+xml"
     }
     print(f"Uploading SVG to {url} with headers: {{'Authorization': 'Bearer ...', 'x-vercel-access': access, 'Content-Type': 'image/svg+xml'}}")
-    response = requests.put(url, headers=headers, data=svg_content.encode('utf-8'))
+    data = svg_content.encode('utf-8')
+    with stage('upload') as timer:
+        response = session_request('PUT', url, headers=headers, data=data)
+        timer.add(bytes=len(data))
     print(f"Upload response status: {response.status_code}, body: {response.text}")
     response.raise_for_status()
     return response.json()["url"]  # This is the public URL to the SVG
 
 
-def get_blob_image_path(identifier):
-    blob_dir = "/tmp/blob/"
-    if not os.path.exists(blob_dir):
+def graph_cache_key(repo, commit, extractor=None, with_symbols=None):
+    """Analysis cache key of the graph of a repo ('owner/repo') at a commit. Covers the extractor,
+    GRAPH_VERSION and symbol mode (default: symbols.SYMBOL_ANALYSIS), so graphs built differently
+    are never served for each other."""
+    extractor = extractor or IMPORT_EXTRACTOR
+    version = f"{extractor}:{EXTRACTOR_VERSIONS.get(extractor, 0)}:{GRAPH_VERSION}"
+    if symbols.SYMBOL_ANALYSIS if with_symbols is None else with_symbols:
+        version += f":symbols{symbols.VERSION}"
+    return f"{repo}@{commit}:{version}"
+
+
+def load_repo_graph(username, repo, github_token=None, workers=None, pool=None, extractor=None, use_cache=True):
+    """Return (graph, commit) for a GitHub repo's default branch.
+    An unchanged commit is served from the analysis cache without downloading or parsing anything."""
+    cache = get_analysis_cache() if use_cache else None
+    extractor = extractor or IMPORT_EXTRACTOR
+    commit = get_head_commit(username, repo, github_token) if cache else None
+    if commit:
+        with stage('graph_cache'):
+            payload = cache.get_graph(graph_cache_key(f"{username}/{repo}", commit, extractor))
+            graph = graph_from_payload(payload) if payload else None
+        if graph is not None:
+            print(f"Using cached import graph for commit {commit}")
+            print(f"Analysis cache: {cache.summary()}")
+            return graph, commit
+
+    repo_url = f"https://github.com/{username}/{repo}"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = pathlib.Path(temp_dir)
+        repo_dir, assets, archive_commit = download_repo(repo_url, temp_path, github_token)
+        graph = build_repo_graph(repo_dir, assets, workers, pool, extractor, cache, repo)
+    commit = archive_commit or commit
+    if cache and commit:
+        cache.put_graph(graph_cache_key(f"{username}/{repo}", commit, extractor), graph_to_payload(graph))
+    if cache:
+        print(f"Analysis cache: {cache.summary()}")
+    return graph, commit
+
+
+def load_local_graph(path, workers=None, pool=None, extractor=None, use_cache=True):
+    """Return the import graph of a project (or monorepo) on disk, analyzed in place"""
+    cache = get_analysis_cache() if use_cache else None
+    graph = build_repo_graph(pathlib.Path(path).resolve(), None, workers, pool, extractor, cache)
+    if cache:
+        print(f"Analysis cache: {cache.summary()}")
+    return graph
+
+
+def local_output_path(path, view='full', depth=1, collapse=None):
+    """Default SVG file for a local analysis: <directory name>[__<view>].svg in the working directory"""
+    name = pathlib.Path(path).resolve().name or 'root'
+    variant = view_variant(view, depth, collapse)
+    return f"{name}__{variant.replace('/', '_')}.svg" if variant else f"{name}.svg"
+
+
+def last_modified(response):
+    """Last-Modified of an HTTP response in epoch seconds, or None"""
+    try:
+        return parsedate_to_datetime(response.headers['Last-Modified']).timestamp()
+    except (KeyError, TypeError, ValueError):
         return None
-    for filename in os.listdir(blob_dir):
-        if identifier in filename:
-            return os.path.join(blob_dir, filename)
-    return None
 
 
-def generate_svg_for_github_repo(username, repo, target_file=None, github_token=None):
-    """Download, analyze, and generate SVG for a GitHub repo. Returns SVG file path. Uses Vercel Blob for caching."""
-    blob_filename = f"svg/{username}_{repo}.svg"
+def generate_svg_for_github_repo(username, repo, target_file=None, github_token=None, workers=None, pool=None,
+                                 extractor=None, use_cache=True, render_backend=None, view='full', depth=1, collapse=None):
+    """Download, analyze, and generate SVG for a GitHub repo. Returns SVG file path. Uses Vercel Blob for caching.
+    The rendered SVG is always left in RESULT_CACHE under svg_result_key()."""
+    blob_name = f"{username}_{repo}" if not target_file else f"{username}_{repo}__{target_file.replace('/', '_')}"
+    variant = view_variant(view, depth, collapse)
+    if variant:
+        blob_name += f"__{variant.replace('/', '_')}"
+    if symbols.SYMBOL_ANALYSIS:
+        blob_name += "__symbols"
+    blob_filename = f"svg/{blob_name}.svg"
     blob_url = f"https://blob.vercel-storage.com/api/blob/{blob_filename}"
+    cache_key = svg_result_key(username, repo, target_file, view=view, depth=depth, collapse=collapse)
 
-    # 1. Check local blob directory first
-    local_blob_path = get_blob_image_path(f"{username}_{repo}")
-    if local_blob_path:
-        print(f"Using existing local image: {local_blob_path}")
-        return local_blob_path
+    # 1. Check the local result cache first
+    entry = RESULT_CACHE.get(cache_key)
+    if entry:
+        print(f"Using existing local image: {entry.path}")
+        return entry.path
 
-    # 2. Check remote Vercel Blob
-    response = requests.head(blob_url)
-    if response.status_code == 200:
-        return blob_url  # SVG is already cached
+    # 2. Check remote Vercel Blob, keeping a local copy (as old as the blob) so the next request stays local.
+    # Blob names carry no commit, so a blob older than RESULT_CACHE_TTL is stale: the conditional request
+    # skips its body and the SVG is rendered again, replacing it
+    fresh_since = time.time() - RESULT_CACHE_TTL
+    try:
+        with stage('blob_check'):
+            response = session_request('GET', blob_url, timeout=10,
+                                       headers={'If-Modified-Since': formatdate(fresh_since, usegmt=True)})
+        modified = last_modified(response)
+        if response.status_code == 200 and (modified is None or modified >= fresh_since):
+            RESULT_CACHE.put(cache_key, response.content, modified)
+            return blob_url  # SVG is already cached
+        if response.status_code in (200, 304):
+            print("Vercel Blob copy is older than RESULT_CACHE_TTL, rendering it again")
+    except requests.RequestException as e:
+        print(f"Could not check Vercel Blob: {e}")
 
-    # 3. If not cached, generate it
-    repo_url = f"https://github.com/{username}/{repo}"
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = pathlib.Path(temp_dir)
-        repo_dir = download_repo(repo_url, temp_path, github_token)
-        src_dir = find_src_directory(repo_dir)
-        repo_name = repo
-        svg_url = analyze_repository(src_dir, repo_name, blob_filename, target_file)
-        return svg_url  # This is the Vercel Blob URL after upload
+    # 3. If not cached, generate it; the JSON report comes almost for free once the graph exists
+    graph, commit = load_repo_graph(username, repo, github_token, workers, pool, extractor, use_cache)
+    reachability = find_unused(graph, target_file)
+    report = analysis_report(graph, reachability, target_file, f"{username}/{repo}", commit)
+    RESULT_CACHE.put(json_result_key(username, repo, target_file), json.dumps(report))
+    return analyze_repository(None, repo, blob_filename, target_file, graph=graph, cache_key=cache_key,
+                              render_backend=render_backend, view=view, depth=depth, collapse=collapse,
+                              reachability=reachability)  # This is the Vercel Blob URL after upload
+
+
+def generate_json_for_github_repo(username, repo, target_file=None, github_token=None, workers=None, pool=None,
+                                  extractor=None, use_cache=True):
+    """Analyze a GitHub repo without rendering anything. Returns the RESULT_CACHE entry of the JSON report
+    (see analysis_report), stored under json_result_key()."""
+    cache_key = json_result_key(username, repo, target_file)
+    entry = RESULT_CACHE.get(cache_key)
+    if entry:
+        print(f"Using existing local report: {entry.path}")
+        return entry
+    graph, commit = load_repo_graph(username, repo, github_token, workers, pool, extractor, use_cache)
+    reachability = find_unused(graph, target_file)
+    print_report(reachability)
+    report = analysis_report(graph, reachability, target_file, f"{username}/{repo}", commit)
+    return RESULT_CACHE.put(cache_key, json.dumps(report))
 
 
 def main():
     """Main entry point"""
-    print("GitHub Repository Analyzer")
-    print("=" * 30)
+    parser = argparse.ArgumentParser(usage="python main.py <username/repo | directory> [target_file] [options]")
+    parser.add_argument("repo", nargs="?",
+                        help="GitHub repo as username/repo or https://github.com/username/repo, or a local directory")
+    parser.add_argument("target_file", nargs="?", help="highlight files connected to this file in green")
+    parser.add_argument("--workers", type=int,
+                        help="import extraction workers (1 = serial, 0 = one per CPU; default: ANALYSIS_WORKERS, "
+                             "or one repo per CPU in batch mode)")
+    parser.add_argument("--pool", choices=["process", "thread"], default=ANALYSIS_POOL,
+                        help="worker pool type for --workers")
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default=IMPORT_EXTRACTOR,
+                        help="import extractor engine")
+    parser.add_argument("--renderer", choices=["auto", *sorted(BACKENDS)], default=RENDER_BACKEND,
+                        help="SVG render backend")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the persistent analysis cache")
+    parser.add_argument("--view", choices=VIEWS, default="full",
+                        help="full graph, directories collapsed into clusters, or only unused files and their neighbors")
+    parser.add_argument("--depth", type=int, default=1, help="directory depth at which --view clusters collapses files")
+    parser.add_argument("--collapse", action="append", metavar="DIR",
+                        help="with --view clusters, collapse only this directory (repeatable), e.g. components/ui")
+    parser.add_argument("--format", choices=["svg", "json"], default="svg",
+                        help="svg renders the graph; json prints the analysis report to stdout without rendering")
+    parser.add_argument("--batch", metavar="FILE", help="analyze every repo listed in FILE (one per line, '-' for stdin)")
+    parser.add_argument("--owner", metavar="NAME", help="analyze every repo of a GitHub user or organization")
+    parser.add_argument("--report", default="batch_report.ndjson",
+                        help="batch report path, NDJSON or .csv; rerunning resumes it")
+    parser.add_argument("--download-workers", type=int, default=4, help="concurrent downloads in batch mode")
+    parser.add_argument("--per-host", type=int, help="max concurrent requests per host (default: PER_HOST_CONCURRENCY)")
+    parser.add_argument("--profile", action="store_true", help="print time, bytes and item counts per pipeline stage")
+    parser.add_argument("--output", metavar="FILE",
+                        help="for a local directory, write the SVG (or JSON report) here (default: <directory>.svg)")
+    parser.add_argument("--symbols", action="store_true",
+                        help="symbol-level reachability through named imports and barrel re-exports (see symbols.py)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep watching a local directory and re-analyze the files that change")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")  # as in app.py; 0 would collapse everything into '/'
+    # With --format json, stdout carries only the report
+    log = sys.stderr if args.format == 'json' else sys.stdout
+    print("GitHub Repository Analyzer", file=log)
+    print("=" * 30, file=log)
     github_token = os.environ.get('GITHUB_TOKEN')
-    if len(sys.argv) > 1:
-        repo_input = sys.argv[1].strip()
+    if args.profile:
+        metrics.enable()
+    started = time.perf_counter()
+    exit_code = 0
+    if args.per_host:
+        http_pool.PER_HOST_CONCURRENCY = args.per_host
+    if args.symbols:
+        symbols.SYMBOL_ANALYSIS = True
+    if args.batch or args.owner:
+        import batch
+        repos = batch.read_repo_list(args.batch) if args.batch else []
+        if args.owner:
+            repos += batch.list_owner_repos(args.owner, github_token)
+        # In batch mode --workers sizes the analysis pool (one repo per worker, one worker per CPU by default)
+        analysis_workers = 0 if args.workers is None else args.workers
+        batch.run_batch(repos, args.report, github_token, args.download_workers, analysis_workers, args.extractor,
+                        not args.no_cache)
+    elif args.repo and os.path.isdir(args.repo.strip()):
+        local_path = args.repo.strip()
+        target_file = args.target_file.strip() if args.target_file else None
+        if args.watch and args.symbols:
+            print("Error: --symbols is not supported with --watch", file=log)
+            exit_code = 1
+        elif args.watch:
+            import watch
+            watch.watch(local_path, target_file, args.format, args.output, args.workers, args.pool, args.extractor,
+                        not args.no_cache, args.renderer, args.view, args.depth, args.collapse)
+        else:
+            try:
+                with contextlib.redirect_stdout(log):
+                    graph = load_local_graph(local_path, args.workers, args.pool, args.extractor, not args.no_cache)
+                    reachability = find_unused(graph, target_file)
+                    local_name = pathlib.Path(local_path).resolve().name
+                    if args.format == 'json':
+                        print_report(reachability)
+                        report = json.dumps(analysis_report(graph, reachability, target_file, local_name))
+                    else:
+                        output = args.output or local_output_path(local_path, args.view, args.depth, args.collapse)
+                        svg_path = analyze_repository(None, local_name, None, target_file, graph=graph,
+                                                      render_backend=args.renderer, view=args.view, depth=args.depth,
+                                                      collapse=args.collapse, reachability=reachability,
+                                                      output_path=output)
+                if args.format == 'json' and args.output:
+                    pathlib.Path(args.output).write_text(report, encoding='utf-8')
+                    print(f"Report written to {args.output}", file=log)
+                elif args.format == 'json':
+                    print(report)
+                else:
+                    print(f"SVG generated at: {svg_path}")
+            except Exception as e:
+                print(f"Error: {e}", file=log)
+                exit_code = 1
+    elif args.watch:
+        print("Error: --watch needs a local directory", file=log)
+        exit_code = 1
+    elif args.repo:
+        repo_input = args.repo.strip()
         if repo_input.startswith('https://github.com/'):
             repo_url = repo_input
             username, repo = repo_url.split('/')[-2:]
@@ -428,18 +1100,29 @@ def main():
         else:
             repo_url = input("GitHub repo URL: ").strip()
             username, repo = repo_url.split('/')[-2:]
-        if len(sys.argv) > 2:
-            target_file = sys.argv[2].strip()
-        else:
-            target_file = None
+        target_file = args.target_file.strip() if args.target_file else None
         try:
-            svg_path = generate_svg_for_github_repo(username, repo, target_file, github_token)
-            print(f"SVG generated at: {svg_path}")
+            if args.format == 'json':
+                with contextlib.redirect_stdout(log):
+                    entry = generate_json_for_github_repo(username, repo, target_file, github_token,
+                                                          args.workers, args.pool, args.extractor, not args.no_cache)
+                print(RESULT_CACHE.read(entry).decode('utf-8'))
+            else:
+                svg_path = generate_svg_for_github_repo(username, repo, target_file, github_token,
+                                                        args.workers, args.pool, args.extractor, not args.no_cache,
+                                                        args.renderer, args.view, args.depth, args.collapse)
+                print(f"SVG generated at: {svg_path}")
         except Exception as e:
-            print(f"Error: {e}")
+            print(f"Error: {e}", file=log)
+            if args.format == 'json':
+                exit_code = 1
     else:
         print("Usage: python main.py <username/repo> [target_file]")
+    if args.profile:
+        print(f"\nStage profile:\n{metrics.profile_report(time.perf_counter() - started)}", file=log)
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
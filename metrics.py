@@ -0,0 +1,162 @@
+"""Per-stage instrumentation: wall time, bytes and item counts for each pipeline stage.
+
+    with stage('download') as s:
+        ...
+        s.add(bytes=n)
+
+Recording is off until enable() is called (the web service and `--profile` turn it on);
+while off, stage() hands back a shared no-op object, so instrumented code pays one call.
+Totals are kept per process and exported as a text table (profile_report) or in the
+Prometheus text format (prometheus_text).
+"""
+import threading
+import time
+
+
+# Histogram buckets for stage durations, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+PREFIX = 'zombie'
+
+_enabled = False
+_lock = threading.Lock()
+_stages = {}  # name -> {'count', 'errors', 'seconds', 'bytes', 'items', 'buckets'}
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+
+
+class _Stage:
+    __slots__ = ('name', 'start', 'bytes', 'items')
+
+    def __init__(self, name):
+        self.name = name
+        self.bytes = 0
+        self.items = 0
+
+    def add(self, bytes=0, items=0):
+        self.bytes += bytes
+        self.items += items
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.start, self.bytes, self.items, exc_type is not None)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def add(self, bytes=0, items=0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name):
+    """Context manager timing one run of a stage (a no-op unless enabled)"""
+    return _Stage(name) if _enabled else _NO_STAGE
+
+
+def record(name, seconds, bytes=0, items=0, failed=False):
+    with _lock:
+        totals = _stages.get(name)
+        if totals is None:
+            totals = _stages[name] = {'count': 0, 'errors': 0, 'seconds': 0.0, 'bytes': 0, 'items': 0,
+                                      'buckets': [0] * len(BUCKETS)}
+        totals['count'] += 1
+        totals['errors'] += failed
+        totals['seconds'] += seconds
+        totals['bytes'] += bytes
+        totals['items'] += items
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                totals['buckets'][i] += 1
+                break
+
+
+def snapshot():
+    """Copy of the per-stage totals, in first-recorded order"""
+    with _lock:
+        return {name: dict(totals, buckets=list(totals['buckets'])) for name, totals in _stages.items()}
+
+
+def profile_report(wall_seconds=None):
+    """Stage breakdown as a text table (share of wall time when wall_seconds is given)"""
+    stages = snapshot()
+    lines = [f"{'stage':<14} {'calls':>6} {'seconds':>9} {'share':>6} {'bytes':>12} {'items':>9}"]
+    for name, totals in stages.items():
+        share = f"{100 * totals['seconds'] / wall_seconds:5.1f}%" if wall_seconds else ''
+        lines.append(f"{name:<14} {totals['count']:>6} {totals['seconds']:>9.3f} {share:>6} "
+                     f"{totals['bytes']:>12} {totals['items']:>9}")
+    if wall_seconds:
+        lines.append(f"{'total':<14} {'':>6} {wall_seconds:>9.3f}")
+    return '\n'.join(lines)
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+
+def prometheus_text(caches=None, counters=None, gauges=None):
+    """Prometheus text exposition of the stage histograms plus extra metrics.
+
+    caches:   {name: (hits, misses)}, exported as request counters and a hit ratio gauge
+    counters: {metric_name: value}, gauges: {metric_name: value} (names without the prefix,
+              labels included, e.g. 'render_seconds_total{backend="dot"}')
+    """
+    out = [f"# HELP {PREFIX}_stage_seconds Wall time per pipeline stage",
+           f"# TYPE {PREFIX}_stage_seconds histogram"]
+    stages = snapshot()
+    for name, totals in stages.items():
+        cumulative = 0
+        for bound, count in zip(BUCKETS, totals['buckets']):
+            cumulative += count
+            out.append(f"{PREFIX}_stage_seconds_bucket{_labels(stage=name, le=bound)} {cumulative}")
+        out.append(f"{PREFIX}_stage_seconds_bucket{_labels(stage=name, le='+Inf')} {totals['count']}")
+        out.append(f"{PREFIX}_stage_seconds_sum{_labels(stage=name)} {totals['seconds']:.6f}")
+        out.append(f"{PREFIX}_stage_seconds_count{_labels(stage=name)} {totals['count']}")
+    for field, help_text in (('errors', 'Stage runs that raised'), ('bytes', 'Bytes handled per stage'),
+                             ('items', 'Items (files, imports, ...) handled per stage')):
+        out.append(f"# HELP {PREFIX}_stage_{field}_total {help_text}")
+        out.append(f"# TYPE {PREFIX}_stage_{field}_total counter")
+        for name, totals in stages.items():
+            out.append(f"{PREFIX}_stage_{field}_total{_labels(stage=name)} {totals[field]}")
+    if caches:
+        out.append(f"# TYPE {PREFIX}_cache_requests_total counter")
+        for name, (hits, misses) in caches.items():
+            out.append(f"{PREFIX}_cache_requests_total{_labels(cache=name, result='hit')} {hits}")
+            out.append(f"{PREFIX}_cache_requests_total{_labels(cache=name, result='miss')} {misses}")
+        out.append(f"# TYPE {PREFIX}_cache_hit_ratio gauge")
+        for name, (hits, misses) in caches.items():
+            ratio = hits / (hits + misses) if hits + misses else 0.0
+            out.append(f"{PREFIX}_cache_hit_ratio{_labels(cache=name)} {ratio:.4f}")
+    for kind, values in (('counter', counters), ('gauge', gauges)):
+        typed = set()
+        for metric, value in (values or {}).items():
+            base = metric.split('{', 1)[0]
+            if base not in typed:
+                typed.add(base)
+                out.append(f"# TYPE {PREFIX}_{base} {kind}")
+            out.append(f"{PREFIX}_{metric} {value}")
+    return '\n'.join(out) + '\n'
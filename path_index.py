@@ -0,0 +1,120 @@
+"""In-memory index of a scanned source tree, used to resolve imports without touching the filesystem."""
+import os
+import pathlib
+
+
+RESOLVE_EXTENSIONS = ['.tsx', '.ts', '.jsx', '.js']
+INDEX_FILES = ['index.tsx', 'index.ts', 'index.jsx', 'index.js']
+
+
+class PathIndex:
+    """Snapshot of every file and directory under a root, built with a single walk.
+
+    Lookups mirror the probing order of the filesystem-based resolver: the exact path,
+    then the path with each of RESOLVE_EXTENSIONS, then a directory's INDEX_FILES.
+    """
+
+    def __init__(self, root_dir, prune_dirs=()):
+        self.root_dir = pathlib.Path(os.path.abspath(root_dir))
+        self.files = []     # Paths in walk order
+        self.memo = {}      # (source directory, specifier) -> resolved Path or None
+        self._files = {}    # path string -> Path
+        self._dirs = {str(self.root_dir)}
+        self._by_stem = {}  # extensionless path string -> highest priority code file
+        self._dir_index = {}
+
+        self.add_tree(self.root_dir, prune_dirs)
+
+    def add_tree(self, directory, prune_dirs=(), include=None):
+        """Walk a directory into the index (`include(path)` filters files), e.g. a public/ folder next to the root"""
+        prune_dirs = set(prune_dirs)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d not in prune_dirs]
+            for d in dirnames:
+                self._add_dir(os.path.join(dirpath, d))
+            for name in filenames:
+                path = pathlib.Path(dirpath, name)
+                if include is None or include(path):
+                    self.add_file(path)
+
+    def add_file(self, path):
+        """Register a file, e.g. an asset that is known from the archive but was not extracted"""
+        path = pathlib.Path(path)
+        path_str = str(path)
+        if path_str in self._files:
+            return
+        self._files[path_str] = path
+        self.files.append(path)
+
+        parent = path.parent
+        while str(parent) not in self._dirs and parent != parent.parent:
+            self._add_dir(str(parent))
+            parent = parent.parent
+
+        if path.suffix in RESOLVE_EXTENSIONS:
+            stem = str(path.with_suffix(''))
+            current = self._by_stem.get(stem)
+            if current is None or RESOLVE_EXTENSIONS.index(path.suffix) < RESOLVE_EXTENSIONS.index(current.suffix):
+                self._by_stem[stem] = path
+
+        if path.name in INDEX_FILES:
+            self._index_entry(str(path.parent), path)
+
+    def remove_file(self, path):
+        """Forget a deleted file; callers holding resolutions in `memo` must clear it"""
+        path = self._files.pop(str(path), None)
+        if path is None:
+            return
+        self.files.remove(path)
+
+        if path.suffix in RESOLVE_EXTENSIONS:
+            stem = str(path.with_suffix(''))
+            if self._by_stem.get(stem) == path:
+                del self._by_stem[stem]
+                for ext in RESOLVE_EXTENSIONS:
+                    candidate = self._files.get(stem + ext)
+                    if candidate is not None:
+                        self._by_stem[stem] = candidate
+                        break
+
+        dir_str = str(path.parent)
+        if path.name in INDEX_FILES and self._dir_index.get(dir_str) == path:
+            del self._dir_index[dir_str]
+            for name in INDEX_FILES:
+                entry = os.path.join(dir_str, name)
+                if entry in self._files or entry in self._dirs:
+                    self._dir_index[dir_str] = pathlib.Path(entry)
+                    break
+
+    def _add_dir(self, dir_str):
+        self._dirs.add(dir_str)
+        # A directory named like an index file also satisfied the resolver's exists() probe
+        if os.path.basename(dir_str) in INDEX_FILES:
+            self._index_entry(os.path.dirname(dir_str), pathlib.Path(dir_str))
+
+    def _index_entry(self, dir_str, path):
+        current = self._dir_index.get(dir_str)
+        if current is None or INDEX_FILES.index(path.name) < INDEX_FILES.index(current.name):
+            self._dir_index[dir_str] = path
+
+    def is_file(self, path):
+        return str(path) in self._files
+
+    def is_dir(self, path):
+        return str(path) in self._dirs
+
+    def lookup(self, target):
+        """Resolve a normalized absolute target path to an indexed file, or None"""
+        target_str = str(target)
+        found = self._files.get(target_str)
+        if found is not None:
+            return found
+        try:
+            found = self._by_stem.get(str(target.with_suffix('')))
+        except ValueError:
+            found = None
+        if found is not None:
+            return found
+        if target_str in self._dirs:
+            return self._dir_index.get(target_str)
+        return None
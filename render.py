@@ -0,0 +1,106 @@
+"""Graph rendering: DOT emitted straight from a networkx graph, SVG from a pluggable backend.
+
+Backends:
+  dot       local Graphviz `dot` binary (default when installed)
+  graphviz  the `graphviz` Python package (also drives the local binary)
+  kroki     kroki.io over HTTP (fallback when Graphviz is not installed)
+"""
+import re
+import shutil
+import subprocess
+import time
+
+
+KROKI_URL = 'https://kroki.io/graphviz/svg'
+RENDER_TIMEOUT = 120
+
+# Per-backend totals: renders, seconds, dot_bytes, svg_bytes
+RENDER_STATS = {}
+
+_BARE_ID = re.compile(r'^(?:[A-Za-z_][A-Za-z0-9_]*|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?))$')
+
+
+def dot_id(value):
+    """Quote a DOT identifier unless it is a plain name or number"""
+    value = str(value)
+    if _BARE_ID.match(value):
+        return value
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+def _attributes(attrs):
+    if not attrs:
+        return ''
+    return ' [' + ', '.join(f"{key}={dot_id(value)}" for key, value in attrs.items()) + ']'
+
+
+def iter_dot(graph, name=''):
+    """Yield the DOT source of a directed graph line by line, attributes included"""
+    yield f"strict digraph {dot_id(name) + ' ' if name else ''}{{\n"
+    for node, attrs in graph.nodes(data=True):
+        yield f"{dot_id(node)}{_attributes(attrs)};\n"
+    for source, target, attrs in graph.edges(data=True):
+        yield f"{dot_id(source)} -> {dot_id(target)}{_attributes(attrs)};\n"
+    yield "}\n"
+
+
+def graph_to_dot(graph, name=''):
+    return ''.join(iter_dot(graph, name))
+
+
+def _render_dot(dot_data):
+    result = subprocess.run(['dot', '-Tsvg'], input=dot_data,
+                            capture_output=True, timeout=RENDER_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"dot failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout.decode('utf-8')
+
+
+def _render_graphviz(dot_data):
+    import graphviz
+    return graphviz.pipe('dot', 'svg', dot_data).decode('utf-8')
+
+
+def _render_kroki(dot_data):
+    from http_pool import session_request
+    headers = {'Content-Type': 'text/plain'}
+    response = session_request('POST', KROKI_URL, headers=headers, data=dot_data, timeout=RENDER_TIMEOUT)
+    response.raise_for_status()
+    return response.text  # This is the SVG as a string
+
+
+BACKENDS = {
+    'dot': _render_dot,
+    'graphviz': _render_graphviz,
+    'kroki': _render_kroki,
+}
+
+
+def default_backends():
+    """Local Graphviz when available, Kroki otherwise (and as the fallback)"""
+    return ['dot', 'kroki'] if shutil.which('dot') else ['kroki']
+
+
+def render_svg(dot_code, backend='auto'):
+    """Render DOT source to an SVG string, recording time and sizes per backend.
+    With backend 'auto', falls back through default_backends() on failure."""
+    backends = default_backends() if backend in (None, 'auto') else [backend]
+    dot_data = dot_code.encode('utf-8')
+    for i, name in enumerate(backends):
+        start = time.perf_counter()
+        try:
+            svg = BACKENDS[name](dot_data)
+        except Exception as e:
+            if i == len(backends) - 1:
+                raise
+            print(f"Render backend '{name}' failed ({e}), trying '{backends[i + 1]}'")
+            continue
+        elapsed = time.perf_counter() - start
+        stats = RENDER_STATS.setdefault(name, {'renders': 0, 'seconds': 0.0, 'dot_bytes': 0, 'svg_bytes': 0})
+        stats['renders'] += 1
+        stats['seconds'] += elapsed
+        svg_size = len(svg.encode('utf-8'))
+        stats['dot_bytes'] += len(dot_data)
+        stats['svg_bytes'] += svg_size
+        print(f"Rendered with {name} in {elapsed:.2f}s ({len(dot_data)} bytes DOT -> {svg_size} bytes SVG)")
+        return svg
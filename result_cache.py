@@ -0,0 +1,175 @@
+"""Keyed cache for finished results (rendered SVGs): in-memory LRU in front of a disk store.
+
+Lookups are O(1): the key names the file, so a hit costs one dict lookup or one stat.
+Entries expire `ttl` seconds after they were written; the disk store is bounded by
+`max_bytes` and the memory layer by `memory_bytes`, both evicting least recently used first.
+
+RESULT_CACHE and the key functions live here rather than in main.py, so that the web service
+can answer a cache hit without importing the analysis pipeline.
+"""
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+import symbols
+from views import view_variant
+
+
+# Rendered results (memory LRU in front of disk); TTL in seconds
+RESULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', '/tmp/blob')
+RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL', str(24 * 3600)))
+RESULT_CACHE_MAX_MB = int(os.environ.get('RESULT_CACHE_MAX_MB', '512'))
+
+# etag is unquoted; last_modified is the write time (epoch seconds) that the TTL counts from
+CacheEntry = collections.namedtuple('CacheEntry', 'key path etag last_modified size')
+
+
+def result_key(*parts):
+    """Stable cache key for e.g. (owner, repo, ref, target_file, variant)"""
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()[:40]
+
+
+def svg_result_key(username, repo, target_file=None, ref='HEAD', view='full', depth=1, collapse=None):
+    """RESULT_CACHE key of the rendered SVG for a repo"""
+    variant = view_variant(view, depth, collapse)
+    kind = f"svg:{variant}" if variant else 'svg'
+    return result_key(username, repo, ref, target_file, kind + ':symbols' if symbols.SYMBOL_ANALYSIS else kind)
+
+
+def json_result_key(username, repo, target_file=None, ref='HEAD'):
+    """RESULT_CACHE key of the JSON analysis report for a repo"""
+    return result_key(username, repo, ref, target_file, 'json:symbols' if symbols.SYMBOL_ANALYSIS else 'json')
+
+
+class ResultCache:
+    def __init__(self, directory, ttl=24 * 3600, max_bytes=512 * 1024 * 1024, memory_bytes=32 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.stats = {'memory_hit': 0, 'disk_hit': 0, 'miss': 0, 'expired': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()  # key -> (entry, content)
+        self._memory_size = 0
+        self._disk = None  # key -> size, least recently used first; loaded on first write
+        self._disk_size = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def get(self, key):
+        """Return the CacheEntry for key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and now - cached[0].last_modified <= self.ttl:
+                self._memory.move_to_end(key)
+                self.stats['memory_hit'] += 1
+                return cached[0]
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.stats['miss'] += 1
+            return None
+        if now - stat.st_mtime > self.ttl:
+            self.stats['expired'] += 1
+            self.stats['miss'] += 1
+            self.delete(key)
+            return None
+        entry = CacheEntry(key, path, f"{key[:16]}-{stat.st_mtime_ns:x}-{stat.st_size:x}", stat.st_mtime, stat.st_size)
+        with self._lock:
+            if self._disk is not None and key in self._disk:
+                self._disk.move_to_end(key)
+        self.stats['disk_hit'] += 1
+        return entry
+
+    def read(self, entry):
+        """Return the content of an entry, served from memory when possible"""
+        with self._lock:
+            cached = self._memory.get(entry.key)
+            if cached is not None and cached[0] == entry:
+                return cached[1]
+        with open(entry.path, 'rb') as f:
+            content = f.read()
+        self._remember(entry, content)
+        return content
+
+    def put(self, key, content, modified=None):
+        """Store content (bytes or str) under key and return its CacheEntry. `modified` (epoch seconds)
+        backdates the entry, e.g. for a copy of a result written elsewhere, so its TTL is not restarted."""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)  # atomic, so readers never see a partial file
+        if modified is not None:
+            os.utime(path, (modified, modified))
+        stat = os.stat(path)
+        entry = CacheEntry(key, path, f"{key[:16]}-{stat.st_mtime_ns:x}-{stat.st_size:x}", stat.st_mtime, stat.st_size)
+        self._remember(entry, content)
+        with self._lock:
+            if self._disk is None:
+                self._disk = self._load_disk_index()
+                self._disk_size = sum(self._disk.values())
+            self._disk_size += entry.size - self._disk.get(key, 0)
+            self._disk[key] = entry.size
+            self._disk.move_to_end(key)
+            self._evict_disk()
+        return entry
+
+    def delete(self, key):
+        with self._lock:
+            cached = self._memory.pop(key, None)
+            if cached is not None:
+                self._memory_size -= cached[0].size
+            if self._disk is not None:
+                self._disk_size -= self._disk.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _remember(self, entry, content):
+        if entry.size > self.memory_bytes // 4:
+            return  # large results are only kept on disk
+        with self._lock:
+            previous = self._memory.pop(entry.key, None)
+            if previous is not None:
+                self._memory_size -= previous[0].size
+            self._memory[entry.key] = (entry, content)
+            self._memory_size += entry.size
+            while self._memory_size > self.memory_bytes:
+                _, (evicted, _) = self._memory.popitem(last=False)
+                self._memory_size -= evicted.size
+
+    def _load_disk_index(self):
+        """Scan the cache directory once per process, oldest files first"""
+        files = []
+        for dir_entry in os.scandir(self.directory):
+            if dir_entry.name.endswith('.cache'):
+                stat = dir_entry.stat()
+                files.append((stat.st_mtime, dir_entry.name[:-len('.cache')], stat.st_size))
+        return collections.OrderedDict((key, size) for _, key, size in sorted(files))
+
+    def _evict_disk(self):
+        while self._disk_size > self.max_bytes and len(self._disk) > 1:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            cached = self._memory.pop(key, None)
+            if cached is not None:
+                self._memory_size -= cached[0].size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.stats['evicted'] += 1
+
+
+RESULT_CACHE = ResultCache(RESULT_CACHE_DIR, RESULT_CACHE_TTL, RESULT_CACHE_MAX_MB * 1024 * 1024)
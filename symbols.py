@@ -0,0 +1,235 @@
+"""Symbol-level usage: which exports of a file are actually used, following barrel re-exports.
+
+File-level reachability keeps a file alive as soon as a reachable file imports it, even when
+the imported names are never used, and a barrel `index.ts` keeps everything it re-exports
+alive. In symbol mode each file records its bindings (scan_bindings):
+
+  imports    [specifier, [export names that are used in the file]]
+             '*' stands for the whole module (namespace import, import(), require()) and ''
+             for a side-effect import; an import whose bindings are all unused has no names
+  reexports  [specifier, [[exported name, imported name]]]  (`export * from` is ['*', '*'])
+  exports    names the file exports itself ('default' included)
+
+Reachability then runs over (file, export name) requests from the entry points. A request
+for a name a file declares evaluates the file, which requests what it imports; a request for
+a re-exported name only passes through the barrel to the file that declares it.
+"""
+import os
+import re
+
+
+# Symbol mode for every analysis ('1'); main.py's --symbols sets it too
+SYMBOL_ANALYSIS = os.environ.get('SYMBOL_ANALYSIS', '0') == '1'
+# Bump when binding extraction changes, to invalidate cached per-file results
+VERSION = 2
+STAR = '*'  # every export of a module
+EVAL = ''   # the module is evaluated for its side effects, no export used
+
+# Comments, left out when looking for uses; strings are matched too, so that '//' or '/*' inside them is left alone
+_COMMENT = re.compile(r"""('[^'\\\n]*(?:\\.[^'\\\n]*)*'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"|`[^`\\]*(?:\\.[^`\\]*)*`)"""
+                      r"|//[^\n]*|/\*[\s\S]*?\*/")
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_EXPORT_LIST = re.compile(r"export\s+(?:type\s+)?\{([^}]*)\}")
+_EXPORT_DECLARATION = re.compile(
+    r"export\s+(?:declare\s+)?(?:(default)\b|(?:async\s+)?(?:const|let|var|function\s*\*?|class|interface|type"
+    r"|enum|abstract\s+class|namespace)\s+([\w$]+))")
+
+
+def _split_names(clause):
+    """[(imported, local)] pairs of a `{ a, b as c, type d }` list"""
+    pairs = []
+    for item in clause.split(','):
+        words = item.split()
+        if words and words[0] == 'type' and len(words) > 1:
+            words = words[1:]
+        if len(words) == 1:
+            pairs.append((words[0], words[0]))
+        elif len(words) == 3 and words[1] == 'as':
+            pairs.append((words[0], words[2]))
+    return pairs
+
+
+def _clause_words(clause):
+    """Words of an import/export clause, braces apart and a leading `type` dropped"""
+    words = clause.replace('{', ' { ').replace('}', ' } ').split()
+    return words[1:] if len(words) > 1 and words[0] == 'type' else words
+
+
+def _imported_names(clause):
+    """[(export name, local name)] bound by `import <clause> from`"""
+    clause = ' '.join(_clause_words(clause))
+    names = []
+    braces = re.search(r"\{([^}]*)\}", clause)
+    if braces:
+        names += _split_names(braces.group(1))
+        clause = clause[:braces.start()] + clause[braces.end():]
+    namespace = re.search(r"\*\s*as\s+([\w$]+)", clause)
+    if namespace:
+        names.append((STAR, namespace.group(1)))
+        clause = clause[:namespace.start()] + clause[namespace.end():]
+    default = clause.strip(' \t\r\n,')
+    if default:
+        names.append(('default', default))
+    return names
+
+
+def _reexported_names(clause):
+    """[[exported name, imported name]] of `export <clause> from`"""
+    words = _clause_words(clause)
+    if words[:1] == ['*']:
+        return [[words[2] if len(words) == 3 and words[1] == 'as' else STAR, STAR]]  # `* as ns` re-exports a namespace
+    braces = re.search(r"\{([^}]*)\}", ' '.join(words))
+    return [[exported, imported] for imported, exported in _split_names(braces.group(1))] if braces else []
+
+
+def scan_bindings(code):
+    """Bindings of a JS/TS file: {'imports': [...], 'reexports': [...], 'exports': [...]} (see module docstring).
+    Statements come from extractors.scan_statements, the lexer that also finds the file's edges."""
+    from extractors import scan_statements  # parsing loads on first use (see app.py)
+    imports, reexports, exports = [], [], []
+    statements = []  # (start, end) of import statements, left out when looking for uses of their bindings
+    bindings = []    # (index in imports, [(export name, local name)])
+    for keyword, start, end, form, clause, specifier in scan_statements(code):
+        if form == 'call':
+            imports.append([specifier, [STAR]])  # import() and require() keep the whole module
+        elif form == 'bare':
+            imports.append([specifier, [EVAL]])
+        elif form == 'from' and keyword == 'export':
+            reexports.append([specifier, _reexported_names(clause)])
+        elif form == 'from':
+            bindings.append((len(imports), _imported_names(clause)))
+            imports.append([specifier, []])
+            statements.append((start, end))
+        elif keyword == 'export':
+            export_list = _EXPORT_LIST.match(code, start)
+            if export_list:
+                exports += [exported for _, exported in _split_names(export_list.group(1))]
+                continue
+            declaration = _EXPORT_DECLARATION.match(code, start)
+            if declaration:
+                exports.append(declaration.group(1) or declaration.group(2))
+
+    # An imported binding is used if its name appears anywhere outside comments and the import statements
+    body, last = [], 0
+    for start, end in statements:
+        body.append(code[last:start])
+        last = end
+    body.append(code[last:])
+    used = set(_IDENTIFIER.findall(_COMMENT.sub(lambda match: match.group(1) or ' ', ''.join(body))))
+    for i, names in bindings:
+        imports[i][1] = [imported for imported, local in names if local in used] if names else [EVAL]
+    return {'imports': imports, 'reexports': reexports, 'exports': list(dict.fromkeys(exports))}
+
+
+class SymbolTable:
+    """Interned bindings of every file in a graph, resolved to node ids, and the reachability over them.
+
+    `files` maps a node to its bindings as stored on the graph: scan_bindings() output with each
+    specifier replaced by the node it resolves to (unresolved specifiers dropped).
+    """
+
+    def __init__(self, graph, files):
+        self.graph = graph
+        self.names = {STAR: 0, EVAL: 1}  # export name -> id
+        self.name_list = [STAR, EVAL]
+        n = len(graph.paths)
+        self.imports = [()] * n    # file id -> [(target id, [name ids])]
+        self.reexports = [{}] * n  # file id -> {exported name id: [(target id, imported name id)]}
+        self.stars = [()] * n      # file id -> [target ids of `export *`]
+        self.exports = [None] * n  # file id -> set of declared name ids; None without bindings
+        self._export_names = {}    # file id -> frozenset of every exported name id (memoized)
+
+        ids = graph.ids
+        for path, record in files.items():
+            file_id = ids.get(path)
+            if file_id is None:
+                continue
+            imports = [(ids[target], [self.intern(name) for name in names])
+                       for target, names in record['imports'] if target in ids]
+            reexports, stars, covered = {}, [], {target for target, _ in record['imports']}
+            for target, pairs in record['reexports']:
+                if target not in ids:
+                    continue
+                covered.add(target)
+                for exported, imported in pairs:
+                    if exported == STAR:
+                        stars.append(ids[target])
+                    else:
+                        reexports.setdefault(self.intern(exported), []).append((ids[target], self.intern(imported)))
+            # Edges the bindings do not explain (asset references, unusual syntax) keep the whole target
+            imports += [(ids[target], [0]) for target in graph.successors(path) if target not in covered]
+            self.imports[file_id] = imports
+            self.reexports[file_id] = reexports
+            self.stars[file_id] = stars
+            self.exports[file_id] = {self.intern(name) for name in record['exports']}
+        for file_id, path in enumerate(graph.paths):
+            if self.exports[file_id] is None:
+                # No bindings (stylesheets, HTML): everything the file references is used
+                self.imports[file_id] = [(ids[target], [0]) for target in graph.successors(path)]
+
+    def intern(self, name):
+        name_id = self.names.get(name)
+        if name_id is None:
+            name_id = self.names[name] = len(self.name_list)
+            self.name_list.append(name)
+        return name_id
+
+    def export_names(self, file_id):
+        """Every name a file exports, its own and re-exported (`export *` leaves out 'default')"""
+        names = self._export_names.get(file_id)
+        if names is None:
+            self._export_names[file_id] = frozenset()  # Cycles of `export *` end here
+            names = set(self.exports[file_id] or ()) | set(self.reexports[file_id])
+            default = self.names.get('default')
+            for target in self.stars[file_id]:
+                names |= self.export_names(target) - {default}
+            names = self._export_names[file_id] = frozenset(names)
+        return names
+
+    def reach(self, entry_points):
+        """Follow (file, name) requests from the entry points (all of whose exports count as used).
+        Returns (touched, evaluated, requested): touched files are needed (barrels a used name passes
+        through included), evaluated ones run their code, and requested holds (file id, name id) pairs."""
+        n = len(self.graph.paths)
+        touched = bytearray(n)
+        evaluated = bytearray(n)
+        requested = set()
+        stack = [(self.graph.ids[path], 0) for path in entry_points]
+        while stack:
+            file_id, name_id = stack.pop()
+            key = (file_id, name_id)
+            if key in requested:
+                continue
+            requested.add(key)
+            touched[file_id] = 1
+            exports = self.exports[file_id]
+            if name_id == 0:
+                # The whole module: every re-export is used too
+                stack += [target for targets in self.reexports[file_id].values() for target in targets]
+                stack += [(target, 0) for target in self.stars[file_id]]
+            elif name_id != 1 and exports is not None and name_id not in exports:
+                forwarded = self.reexports[file_id].get(name_id)
+                if forwarded is None:
+                    forwarded = [(target, name_id) for target in self.stars[file_id]
+                                 if name_id in self.export_names(target)]
+                if forwarded:
+                    stack += forwarded
+                    continue
+                # A name the file does not seem to export: keep the file, as the file-level pass would
+            if not evaluated[file_id]:
+                evaluated[file_id] = 1
+                for target, names in self.imports[file_id]:
+                    stack += [(target, name) for name in names]
+        return touched, evaluated, requested
+
+    def unused_exports(self, evaluated, requested, skip=()):
+        """{file: [declared export names nobody requests]} for evaluated files not in skip"""
+        unused = {}
+        for file_id, path in enumerate(self.graph.paths):
+            exports = self.exports[file_id]
+            if not evaluated[file_id] or not exports or path in skip or (file_id, 0) in requested:
+                continue
+            names = [self.name_list[name_id] for name_id in exports if (file_id, name_id) not in requested]
+            if names:
+                unused[path] = sorted(names)
+        return unused
@@ -0,0 +1,91 @@
+"""Render views: turn an analyzed ImportGraph into the colored networkx graph that gets drawn.
+
+  full      every file (the default)
+  clusters  files below a directory collapsed into one node per directory, with counts
+  unused    only unused files (code and assets) and their direct importers/imports
+
+`categories` maps each node to its node_category() in main.py. networkx is imported on first use,
+so the web service can read VIEWS and view_variant() without loading it.
+"""
+
+
+VIEWS = ['full', 'clusters', 'unused']
+# Node color per category
+NODE_COLORS = {'asset': 'yellow', 'unused_asset': 'khaki4', 'target': 'lightgreen', 'connected': 'lightblue',
+               'ui': 'orange', 'unused': 'red'}
+# Categories counted as unused
+UNUSED_CATEGORIES = ('unused', 'ui', 'unused_asset')
+# Cluster color: the first category present among its files
+CLUSTER_PRIORITY = ['unused', 'ui', 'unused_asset', 'target', 'connected', 'asset']
+
+
+def full_view(graph, categories):
+    view = graph.to_networkx(dir='back')
+    for node in view.nodes():
+        view.nodes[node]['color'] = NODE_COLORS[categories[node]]
+        view.nodes[node]['style'] = 'filled'
+    return view
+
+
+def cluster_of(node, depth=1, collapse=None):
+    """Directory node that `node` collapses into, or the node itself if it stays a file.
+    With `collapse` prefixes (e.g. ['components/ui', 'pages']), only those subtrees are collapsed;
+    otherwise every file more than `depth` directories deep collapses into its depth-`depth` directory."""
+    if collapse:
+        for prefix in collapse:
+            if node.startswith(prefix.rstrip('/') + '/'):
+                return prefix.rstrip('/') + '/'
+        return node
+    parts = node.split('/')
+    return '/'.join(parts[:depth]) + '/' if len(parts) > depth else node
+
+
+def cluster_view(graph, categories, depth=1, collapse=None):
+    members = {}
+    for node in graph:
+        members.setdefault(cluster_of(node, depth, collapse), []).append(node)
+    import networkx as nx
+    view = nx.DiGraph()
+    for cluster, nodes in members.items():
+        if len(nodes) == 1 and nodes[0] == cluster:
+            view.add_node(cluster, color=NODE_COLORS[categories[cluster]], style='filled')
+            continue
+        present = {categories[node] for node in nodes}
+        color = NODE_COLORS[next(category for category in CLUSTER_PRIORITY if category in present)]
+        unused = sum(1 for node in nodes if categories[node] in UNUSED_CATEGORIES)
+        label = f"{cluster}\\n{len(nodes)} files" + (f", {unused} unused" if unused else '')
+        view.add_node(cluster, label=label, shape='folder', color=color, style='filled')
+    groups = {node: cluster for cluster, nodes in members.items() for node in nodes}
+    for source, target in graph.edges():
+        if groups[source] != groups[target]:
+            view.add_edge(groups[source], groups[target], dir='back')
+    return view
+
+
+def unused_view(graph, categories):
+    unused = {node for node in graph if categories[node] in UNUSED_CATEGORIES}
+    edges = [(source, target) for source, target in graph.edges() if source in unused or target in unused]
+    keep = unused.union(*edges)
+    import networkx as nx
+    view = nx.DiGraph()
+    for node in graph:
+        if node in keep:
+            view.add_node(node, color=NODE_COLORS[categories[node]], style='filled')
+    view.add_edges_from(edges, dir='back')
+    return view
+
+
+def build_view(graph, categories, view='full', depth=1, collapse=None):
+    """Colored networkx graph for the requested view"""
+    if view == 'clusters':
+        return cluster_view(graph, categories, depth, collapse)
+    if view == 'unused':
+        return unused_view(graph, categories)
+    return full_view(graph, categories)
+
+
+def view_variant(view='full', depth=1, collapse=None):
+    """Suffix identifying a view in cache keys and file names ('' for the full view)"""
+    if view == 'clusters':
+        return f"clusters-{','.join(collapse)}" if collapse else f"clusters-{depth}"
+    return '' if view in (None, 'full') else view
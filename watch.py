@@ -0,0 +1,273 @@
+"""Watch mode: keep a local project's import graph up to date as files are saved.
+
+    python main.py ./my-app --watch [--format json] [--output FILE]
+
+The tree is polled (file mtimes and sizes, no extra dependency) every WATCH_INTERVAL seconds.
+Only added and modified code files (and stylesheets/HTML) are re-read and re-parsed. Besides
+them, only the files whose imports could now resolve differently are re-resolved: those importing
+a path with the same name or stem as an added/removed file, its directory for an index file, or
+an asset with the same file name. The unused
+list is then recomputed with one reachability pass over the compact graph and the changes
+are printed; the SVG (or JSON report) is rewritten if a render or output file was asked for.
+"""
+import contextlib
+import json
+import os
+import pathlib
+import sys
+import time
+
+import main
+from asset_refs import AssetIndex, is_reference
+from import_graph import ImportGraph
+from path_index import INDEX_FILES
+from metrics import stage
+
+
+WATCH_INTERVAL = float(os.environ.get('WATCH_INTERVAL', '0.25'))
+
+
+def snapshot(root_dir, prune_dirs=()):
+    """{path: (mtime_ns, size)} for every file under root_dir, pruned like PathIndex"""
+    state = {}
+    prune_dirs = set(prune_dirs)
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames[:] = [d for d in dirnames if d not in prune_dirs]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # Deleted between listing and stat
+            state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def tree_snapshot(roots):
+    """One snapshot of several directories"""
+    state = {}
+    for root in roots:
+        state.update(snapshot(root, main.SKIP_PATTERNS))
+    return state
+
+
+def diff_snapshots(old, new):
+    """(added, removed, modified) paths between two snapshots"""
+    added = [path for path in new if path not in old]
+    removed = [path for path in old if path not in new]
+    modified = [path for path in new if path in old and new[path] != old[path]]
+    return added, removed, modified
+
+
+class LocalAnalysis:
+    """Import graph of a source tree on disk that can be updated file by file.
+
+    Mirrors build_import_graph for one project: same walk (with public/), node order (new files are
+    appended), resolution and edges.
+    """
+
+    def __init__(self, root_dir, workers=None, pool=None, extractor=None, cache=None, workspace=None):
+        self.extractor = extractor
+        self.workspace = workspace
+        with stage('walk') as timer:
+            self.index, self.public_dir = main.index_source_tree(root_dir, None, workspace)
+            timer.add(items=len(self.index.files))
+        self.root_dir = self.index.root_dir
+        if workspace is not None:
+            workspace.index = self.index
+        code_files, other_files = main.collect_files(self.index.files, self.root_dir)
+        print(f"Found {len(code_files)} code files and {len(other_files)} other files "
+              f"({len(code_files) + len(other_files)} total)")
+        self.nodes = dict.fromkeys(self._rel(file) for file in code_files + other_files)
+        self.assets = AssetIndex(other_files, self.public_dir)
+        self.imports = {}  # scanned file -> import specifiers
+        self.edges = {}    # scanned file -> resolved targets
+        self.probes = {}   # import target path (and its stem, or an asset's 'name:') -> files importing it
+
+        sources = [(file, workspace, self.assets) for file in main.scanned_files(code_files, other_files)]
+        for file, imports, targets, _ in main.scan_sources(sources, self.root_dir, self.index, workers, pool,
+                                                           extractor, cache):
+            self._set_imports(file, imports, targets)
+
+    def _rel(self, path):
+        return main.node_name(pathlib.Path(path), self.root_dir)
+
+    def _path(self, rel):
+        return pathlib.Path(os.path.normpath(self.root_dir / rel))
+
+    def _probe_keys(self, file, imports):
+        """Paths whose appearance or removal can change how `imports` of `file` resolve"""
+        keys = set()
+        for import_path in imports:
+            if self.workspace is not None:
+                # Aliases and baseUrl imports may resolve to any of several paths, depending on what exists
+                targets = self.workspace.candidates(import_path, file)
+            else:
+                target = main.import_target(import_path, file, self.root_dir)
+                targets = [pathlib.Path(os.path.normpath(target))] if target is not None else []
+            for target in targets:
+                keys.add(str(target))
+                try:
+                    keys.add(str(target.with_suffix('')))
+                except ValueError:
+                    pass
+            if is_reference(import_path):
+                # Asset references may also resolve by file name alone
+                keys.add('name:' + import_path.split('?', 1)[0].split('#', 1)[0].rsplit('/', 1)[-1])
+        return keys
+
+    def _forget(self, rel):
+        imports = self.imports.pop(rel, None)
+        self.edges.pop(rel, None)
+        for key in self._probe_keys(self._path(rel), imports or ()):
+            importers = self.probes.get(key)
+            if importers is not None:
+                importers.discard(rel)
+                if not importers:
+                    del self.probes[key]
+
+    def _set_imports(self, file, imports, targets=None):
+        """Record a file's imports and their resolved targets (resolved here unless given)"""
+        rel = self._rel(file)
+        self._forget(rel)
+        self.imports[rel] = imports
+        for key in self._probe_keys(file, imports):
+            self.probes.setdefault(key, set()).add(rel)
+        if targets is None:
+            targets = main.resolve_edges(file, imports, self.root_dir, self.index, self.workspace, self.assets)
+        self.edges[rel] = targets
+
+    def _importers(self, path):
+        """Code files whose imports may resolve to (or away from) path"""
+        keys = [str(path), str(path.with_suffix('')), 'name:' + path.name]
+        if path.name in INDEX_FILES:
+            keys.append(str(path.parent))
+        return set().union(*(self.probes.get(key, ()) for key in keys))
+
+    def _in_tree(self, path):
+        """Whether a changed path belongs to the walk: the source tree, or an asset in public/"""
+        return path.is_relative_to(self.root_dir) or path.suffix.lower() not in main.CODE_EXTENSIONS
+
+    def update(self, added=(), removed=(), modified=()):
+        """Apply file changes (absolute paths). Returns the number of files re-parsed."""
+        added = [path for path in map(pathlib.Path, added) if self._in_tree(path)]
+        removed = [path for path in map(pathlib.Path, removed) if self._in_tree(path)]
+        modified = [path for path in map(pathlib.Path, modified) if self._in_tree(path)]
+        stale = set()  # scanned files to re-resolve
+        for path in removed:
+            rel = self._rel(path)
+            self.index.remove_file(path)
+            self.assets.remove_file(path)
+            self.nodes.pop(rel, None)
+            self._forget(rel)
+        for path in added:
+            self.index.add_file(path)
+            code_files, other_files = main.collect_files([path], self.root_dir)
+            if code_files or other_files:
+                self.nodes[self._rel(path)] = None
+            for file in other_files:
+                self.assets.add_file(file)
+        if added or removed:
+            # Resolutions are memoized per (directory, specifier); any of them may have changed
+            self.index.memo.clear()
+            for path in added + removed:
+                stale |= self._importers(path)
+
+        parsed = 0
+        for path in added + modified:
+            if not main.scanned_files(*main.collect_files([path], self.root_dir)):
+                continue
+            imports, error = main.read_imports(path, self.extractor)
+            if error is not None:
+                print(f"Error processing {path}: {error}")
+                continue
+            parsed += 1
+            rel = self._rel(path)
+            if self.imports.get(rel) != imports or rel not in self.edges:
+                self._set_imports(path, imports)
+            stale.discard(rel)
+        for rel in stale:
+            if rel in self.imports:
+                self.edges[rel] = main.resolve_edges(self._path(rel), self.imports[rel], self.root_dir, self.index,
+                                                     self.workspace, self.assets)
+        return parsed
+
+    def graph(self):
+        """The current graph as an ImportGraph"""
+        return ImportGraph.from_edges(self.nodes, ((source, target) for source, targets in self.edges.items()
+                                                   for target in targets))
+
+
+def write_output(graph, reachability, my_companies_file, fmt, output, render_backend, view, depth, collapse,
+                 repo=None):
+    """Rewrite the SVG or JSON report after an update (JSON goes to stdout, one line per update, without output)"""
+    if fmt == 'json':
+        report = json.dumps(main.analysis_report(graph, reachability, my_companies_file, repo))
+        if output:
+            pathlib.Path(output).write_text(report, encoding='utf-8')
+        else:
+            print(report, flush=True)
+        return
+    try:
+        svg = main.render_graph_svg(graph, reachability, my_companies_file, render_backend, view, depth, collapse)
+    except Exception as e:
+        # Keep watching; the next save renders again
+        print(f"Could not render SVG: {e}")
+        return
+    pathlib.Path(output).write_text(svg, encoding='utf-8')
+    print(f"Wrote {output}")
+
+
+def watch(path, my_companies_file=None, fmt='svg', output=None, workers=None, pool=None, extractor=None,
+          use_cache=True, render_backend=None, view='full', depth=1, collapse=None, interval=None):
+    """Analyze a local directory, then re-analyze incrementally on every change until interrupted"""
+    log = sys.stderr if fmt == 'json' else sys.stdout
+    if fmt == 'svg' and not output:
+        output = main.local_output_path(path, view, depth, collapse)
+    src_dir, workspace = main.find_project(pathlib.Path(path).resolve())
+    if src_dir is None:
+        print("Error: --watch follows one project at a time; pass one of the workspaces: "
+              + ', '.join(str(w.root) for w in workspace), file=log)
+        return
+    # public/ next to src/ is watched too, for its assets
+    public_dir = main.public_directory(src_dir, workspace)
+    roots = [src_dir] + ([public_dir] if not public_dir.is_relative_to(src_dir) else [])
+    state = tree_snapshot(roots)
+    cache = main.get_analysis_cache() if use_cache else None
+    print(f"Analyzing {src_dir}", file=log)
+    with contextlib.redirect_stdout(log):
+        analysis = LocalAnalysis(src_dir, workers, pool, extractor, cache, workspace)
+        graph = analysis.graph()
+        reachability = main.find_unused(graph, my_companies_file)
+        main.print_report(reachability)
+    write_output(graph, reachability, my_companies_file, fmt, output, render_backend, view, depth, collapse,
+                 str(src_dir))
+    print(f"Watching {src_dir} for changes (Ctrl-C to stop)", file=log, flush=True)
+
+    try:
+        while True:
+            time.sleep(interval or WATCH_INTERVAL)
+            current = tree_snapshot(roots)
+            added, removed, modified = diff_snapshots(state, current)
+            state = current
+            if not (added or removed or modified):
+                continue
+            started = time.perf_counter()
+            parsed = analysis.update(added, removed, modified)
+            graph = analysis.graph()
+            previous = set(reachability['unused'])
+            reachability = main.find_unused(graph, my_companies_file)
+            unused = set(reachability['unused'])
+            elapsed = 1000 * (time.perf_counter() - started)
+            print(f"{len(added)} added, {len(removed)} removed, {len(modified)} modified; re-parsed {parsed} "
+                  f"in {elapsed:.1f} ms: {len(unused)} unused of {len(graph)} files", file=log)
+            for node in reachability['unused']:
+                if node not in previous:
+                    print(f"  + {node}", file=log)
+            for node in sorted(previous - unused):
+                print(f"  - {node}", file=log)
+            log.flush()
+            write_output(graph, reachability, my_companies_file, fmt, output, render_backend, view, depth, collapse,
+                         str(src_dir))
+    except KeyboardInterrupt:
+        print("Stopped watching", file=log)
@@ -0,0 +1,282 @@
+"""Workspace discovery for monorepos, and per-workspace import aliases from tsconfig/jsconfig.
+
+A workspace is a package with its own package.json. They are taken from the root's
+`workspaces` field (npm/yarn) or pnpm-workspace.yaml when declared, and otherwise every
+React/TypeScript package.json in the tree is one. Each workspace resolves its own
+`compilerOptions.paths` and `baseUrl` (following relative `extends` and `references`),
+and imports of another workspace's package name resolve to that package's source.
+"""
+import fnmatch
+import json
+import os
+import pathlib
+
+
+PROJECT_DEPENDENCIES = ["react", "typescript", "@types/react", "next", "vite"]
+CONFIG_FILES = ['tsconfig.json', 'jsconfig.json']
+# package.json fields naming a package's entry file, in order of preference. Build output (dist/) is
+# not in the repo, so the first one that exists wins, then the source index.
+ENTRY_FIELDS = ['source', 'exports', 'module', 'main', 'types', 'typings']
+
+
+def read_json(path):
+    """Parse a JSON file that may contain comments and trailing commas (tsconfig style); None on failure"""
+    try:
+        text = pathlib.Path(path).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '"':
+            end = i + 1
+            while end < n and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            out.append(text[i:end + 1])
+            i = end + 1
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif c in '}]':
+            # Drop a trailing comma before the closing bracket
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+            out.append(c)
+            i += 1
+        else:
+            out.append(c)
+            i += 1
+    try:
+        return json.loads(''.join(out))
+    except ValueError:
+        return None
+
+
+def is_project(package):
+    """Whether a parsed package.json looks like a React/TypeScript project"""
+    deps = {**package.get("dependencies", {}), **package.get("devDependencies", {})}
+    return any(dep in deps for dep in PROJECT_DEPENDENCIES)
+
+
+def read_compiler_options(config_path, seen=None):
+    """(baseUrl, paths, paths_base) of a tsconfig/jsconfig, with relative `extends` and `references`
+    followed. baseUrl and paths_base are absolute directories, or None when unset."""
+    config_path = pathlib.Path(os.path.normpath(config_path))
+    seen = seen if seen is not None else set()
+    if config_path in seen or len(seen) > 16:
+        return None, None, None
+    seen.add(config_path)
+    config = read_json(config_path)
+    if not isinstance(config, dict):
+        return None, None, None
+    base_url = paths = paths_base = None
+
+    extends = config.get('extends')
+    for parent in ([extends] if isinstance(extends, str) else extends or []):
+        if isinstance(parent, str) and parent.startswith('.'):
+            parent_path = config_path.parent / parent
+            if parent_path.suffix != '.json':
+                parent_path = parent_path.with_name(parent_path.name + '.json')
+            parent_options = read_compiler_options(parent_path, seen)
+            base_url = parent_options[0] or base_url
+            if parent_options[1] is not None:
+                paths, paths_base = parent_options[1], parent_options[2]
+
+    options = config.get('compilerOptions') or {}
+    if isinstance(options.get('baseUrl'), str):
+        base_url = pathlib.Path(os.path.normpath(config_path.parent / options['baseUrl']))
+    if isinstance(options.get('paths'), dict):
+        paths = options['paths']
+        paths_base = config_path.parent
+    # paths are relative to baseUrl when one is set
+    if paths is not None and base_url is not None:
+        paths_base = base_url
+
+    # Solution-style configs (e.g. Vite's tsconfig.json) keep the options in referenced files
+    if paths is None:
+        for reference in config.get('references') or []:
+            reference_path = config_path.parent / (reference or {}).get('path', '')
+            if reference_path.suffix != '.json':
+                reference_path = reference_path / 'tsconfig.json'
+            reference_options = read_compiler_options(reference_path, seen)
+            if reference_options[1] is not None:
+                base_url = base_url or reference_options[0]
+                paths, paths_base = reference_options[1], reference_options[2]
+                break
+    return base_url, paths, paths_base
+
+
+class Workspace:
+    """One package of a (mono)repo and the rules for resolving the imports written inside it"""
+
+    def __init__(self, root, package=None, aliases=None):
+        self.root = pathlib.Path(os.path.abspath(root))
+        package = package or {}
+        self.package = package
+        self.name = package.get('name') if isinstance(package.get('name'), str) else None
+        self.src_dir = self.root / 'src' if (self.root / 'src').is_dir() else self.root
+        self.packages = {}  # package name -> Workspace, shared by every workspace of the repo
+        self.index = None   # shared PathIndex, set before resolving
+        self.base_url = None
+        self.paths = []     # (pattern, [substitution paths]), longest prefix first
+
+        for config_file in CONFIG_FILES:
+            if (self.root / config_file).is_file():
+                base_url, paths, paths_base = read_compiler_options(self.root / config_file)
+                self.base_url = base_url
+                for pattern, substitutions in (paths or {}).items():
+                    if isinstance(substitutions, list):
+                        self.paths.append((pattern, [os.path.normpath(paths_base / s) for s in substitutions
+                                                     if isinstance(s, str)]))
+                break
+        if not self.paths:
+            # No tsconfig paths: the default aliases, with 'src/' meaning this workspace's source directory
+            for alias, replacement in (aliases or {}).items():
+                target = self.src_dir / replacement[4:] if replacement.startswith('src/') else self.root / replacement
+                self.paths.append((alias + '*', [os.path.join(os.path.normpath(target), '*')]))
+        self.paths.sort(key=lambda item: -len(item[0].split('*')[0]))
+
+    def __repr__(self):
+        return f"Workspace({self.name or self.root})"
+
+    def _first(self, candidates):
+        """First candidate that resolves in the shared index (or the first one, without an index)"""
+        candidates = [pathlib.Path(os.path.normpath(c)) for c in candidates]
+        if self.index is not None:
+            for candidate in candidates:
+                if self.index.lookup(candidate) is not None:
+                    return candidate
+        return candidates[0] if candidates else None
+
+    def _entry_candidates(self):
+        candidates = []
+        for field in ENTRY_FIELDS:
+            value = self.package.get(field)
+            if field == 'exports' and isinstance(value, dict):
+                value = value.get('.', value)
+                while isinstance(value, dict):
+                    value = next((v for k, v in value.items() if k in ('source', 'import', 'default', 'types')),
+                                 None)
+            if isinstance(value, str):
+                candidates.append(self.root / value)
+        return candidates + [self.src_dir / 'index', self.root / 'index']
+
+    def entry(self):
+        """Source file this workspace's package name resolves to"""
+        return self._first(self._entry_candidates())
+
+    def _package_candidates(self, import_path):
+        parts = import_path.split('/')
+        size = 2 if import_path.startswith('@') else 1
+        workspace = self.packages.get('/'.join(parts[:size]))
+        if workspace is None:
+            return workspace, []
+        rest = '/'.join(parts[size:])
+        if not rest:
+            return workspace, workspace._entry_candidates()
+        return workspace, [workspace.src_dir / rest, workspace.entry().parent / rest, workspace.root / rest]
+
+    def _local_candidates(self, import_path, source_file):
+        """(candidates, bare): paths the import may point at, in order; bare imports only count if they exist"""
+        if import_path in ('.', '..') or import_path.startswith('./') or import_path.startswith('../'):
+            return [source_file.parent / import_path], False
+        for pattern, substitutions in self.paths:
+            prefix, star, suffix = pattern.partition('*')
+            if star and import_path.startswith(prefix) and import_path.endswith(suffix) \
+                    and len(import_path) >= len(prefix) + len(suffix):
+                matched = import_path[len(prefix):len(import_path) - len(suffix)]
+                return [s.replace('*', matched, 1) for s in substitutions], False
+            if not star and import_path == pattern:
+                return substitutions, False
+        if import_path.startswith('src/'):
+            return [self.src_dir / import_path[4:]], False
+        if self.base_url is not None:
+            return [self.base_url / import_path], True
+        if import_path.startswith('.'):
+            return [self.src_dir / import_path], False
+        return [], False
+
+    def candidates(self, import_path, source_file):
+        """Every path an import may resolve to, whether or not it exists (for invalidation in watch mode)"""
+        paths = self._package_candidates(import_path)[1] + self._local_candidates(import_path, source_file)[0]
+        return [pathlib.Path(os.path.normpath(path)) for path in paths]
+
+    def package_target(self, import_path):
+        """Target of an import of some workspace's package (`@acme/ui` or `@acme/ui/button`), or None"""
+        workspace, candidates = self._package_candidates(import_path)
+        return workspace._first(candidates) if candidates else None
+
+    def local_target(self, import_path, source_file):
+        """Target of a relative, aliased or baseUrl import written in source_file, or None if non-local"""
+        candidates, bare = self._local_candidates(import_path, source_file)
+        target = self._first(candidates)
+        if bare and (self.index is None or self.index.lookup(target) is None):
+            return None  # Bare specifiers resolve from baseUrl, but only when something is there
+        return target
+
+
+def _declared_patterns(repo_dir):
+    """Workspace globs declared at the repo root (package.json `workspaces`, pnpm-workspace.yaml), or None"""
+    package = read_json(repo_dir / 'package.json') or {}
+    declared = package.get('workspaces')
+    if isinstance(declared, dict):
+        declared = declared.get('packages')
+    if isinstance(declared, list):
+        return [p for p in declared if isinstance(p, str)]
+    try:
+        lines = (repo_dir / 'pnpm-workspace.yaml').read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return None
+    patterns, in_packages = [], False
+    for line in lines:
+        stripped = line.split('#', 1)[0].strip()
+        if not stripped:
+            continue
+        if not line[0].isspace() and not stripped.startswith('-'):
+            in_packages = stripped.rstrip(':').strip() == 'packages'
+        elif in_packages and stripped.startswith('-'):
+            patterns.append(stripped[1:].strip().strip('\'"'))
+    return patterns
+
+
+def find_workspaces(repo_dir, aliases=None, prune_dirs=()):
+    """Every workspace of a repo, sorted by path, with their `packages` map linked.
+    Returns [] when no package.json qualifies."""
+    repo_dir = pathlib.Path(os.path.abspath(repo_dir))
+    prune_dirs = set(prune_dirs)
+    manifests = []
+    for dirpath, dirnames, filenames in os.walk(repo_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in prune_dirs)
+        if 'package.json' in filenames:
+            manifests.append(pathlib.Path(dirpath))
+
+    patterns = _declared_patterns(repo_dir)
+    workspaces = []
+    for directory in manifests:
+        package = read_json(directory / 'package.json')
+        if not isinstance(package, dict):
+            continue
+        rel = directory.relative_to(repo_dir).as_posix()
+        if patterns is not None:
+            if directory == repo_dir:
+                # The root of a declared monorepo is only analyzed if it has sources of its own
+                selected = is_project(package) and (directory / 'src').is_dir()
+            else:
+                # fnmatch's '*' also matches '/', so 'packages/*' covers nested packages like '**' does
+                selected = any(fnmatch.fnmatch(rel, p.rstrip('/')) for p in patterns if not p.startswith('!')) \
+                    and not any(fnmatch.fnmatch(rel, p[1:].rstrip('/')) for p in patterns if p.startswith('!'))
+        else:
+            selected = is_project(package)
+        if selected:
+            workspaces.append(Workspace(directory, package, aliases))
+
+    packages = {workspace.name: workspace for workspace in workspaces if workspace.name}
+    for workspace in workspaces:
+        workspace.packages = packages
+    return workspaces